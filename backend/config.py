@@ -21,6 +21,37 @@ class Config:
     OMDB_API_KEY = os.getenv('OMDB_API_KEY', 'b5e04f10')
     OMDB_API_URL = 'http://www.omdbapi.com/'
     
+    # OMDb Response Cache (TTLs in seconds)
+    OMDB_CACHE_MAX_ENTRIES = int(os.getenv('OMDB_CACHE_MAX_ENTRIES', '2000'))
+    OMDB_SEARCH_CACHE_TTL = int(os.getenv('OMDB_SEARCH_CACHE_TTL', str(6 * 3600)))
+    OMDB_DETAIL_CACHE_TTL = int(os.getenv('OMDB_DETAIL_CACHE_TTL', str(7 * 24 * 3600)))
+    
+    # OMDb request rate limit (per process) and detail fan-out
+    OMDB_RATE_PER_SECOND = float(os.getenv('OMDB_RATE_PER_SECOND', '5'))
+    OMDB_RATE_BURST = int(os.getenv('OMDB_RATE_BURST', '10'))
+    OMDB_MAX_WORKERS = int(os.getenv('OMDB_MAX_WORKERS', '8'))
+    
+    # Seconds a worker may hold the lease for fetching a missing movie
+    FETCH_LEASE_SECONDS = int(os.getenv('FETCH_LEASE_SECONDS', '15'))
+    
+    # Outbound HTTP clients (timeouts in seconds)
+    HTTP_UPSTREAMS = {
+        'omdb': {
+            'pool_size': int(os.getenv('OMDB_POOL_SIZE', '10')),
+            'connect_timeout': float(os.getenv('OMDB_CONNECT_TIMEOUT', '3.05')),
+            'read_timeout': float(os.getenv('OMDB_READ_TIMEOUT', '10')),
+            'retries': int(os.getenv('OMDB_RETRIES', '2')),
+            'backoff': 0.3
+        },
+        'newsapi': {
+            'pool_size': int(os.getenv('NEWSAPI_POOL_SIZE', '2')),
+            'connect_timeout': float(os.getenv('NEWSAPI_CONNECT_TIMEOUT', '3.05')),
+            'read_timeout': float(os.getenv('NEWSAPI_READ_TIMEOUT', '10')),
+            'retries': int(os.getenv('NEWSAPI_RETRIES', '1')),
+            'backoff': 0.5
+        }
+    }
+    
     # Flask Configuration
     SECRET_KEY = os.getenv('SECRET_KEY', 'your-flask-secret-key')
     DEBUG = os.getenv('DEBUG', 'True') == 'True'
@@ -38,6 +69,87 @@ class Config:
     
     # Pagination
     ITEMS_PER_PAGE = 20
+    MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', '100'))
+    
+    # Largest batch a backfill may read and write at once
+    BACKFILL_MAX_BATCH_SIZE = 5000
+    
+    # Write-behind view counters: flush every N seconds or at N pending documents
+    COUNTER_FLUSH_INTERVAL = float(os.getenv('COUNTER_FLUSH_INTERVAL', '5'))
+    COUNTER_FLUSH_THRESHOLD = int(os.getenv('COUNTER_FLUSH_THRESHOLD', '500'))
+    
+    # Trending: hourly view buckets scored with exponential decay
+    TRENDING_WINDOW_HOURS = int(os.getenv('TRENDING_WINDOW_HOURS', '168'))
+    TRENDING_HALF_LIFE_HOURS = float(os.getenv('TRENDING_HALF_LIFE_HOURS', '24'))
+    TRENDING_TOP_N = int(os.getenv('TRENDING_TOP_N', '50'))
+    TRENDING_CANDIDATES = 5000
+    TRENDING_REFRESH_INTERVAL = int(os.getenv('TRENDING_REFRESH_INTERVAL', '600'))
+    TRENDING_LEASE_SECONDS = 120
+    
+    # Collaborative recommendations: neighbors kept per movie, users read per
+    # batch by the offline job, users a pair needs in common and the
+    # shrinkage that discounts pairs with few of them, and liked movies used
+    # to seed a user's list
+    RECOMMEND_TOP_K = int(os.getenv('RECOMMEND_TOP_K', '50'))
+    RECOMMEND_BATCH_SIZE = int(os.getenv('RECOMMEND_BATCH_SIZE', '5000'))
+    RECOMMEND_MIN_SUPPORT = int(os.getenv('RECOMMEND_MIN_SUPPORT', '2'))
+    RECOMMEND_SHRINKAGE = float(os.getenv('RECOMMEND_SHRINKAGE', '10'))
+    RECOMMEND_MAX_SEEDS = 50
+    
+    # Content-based "more like this": hashed TF-IDF columns, similar movies
+    # kept per movie, rows scored per block, the most viewed candidates a new
+    # movie is compared with, and new movies waiting to be placed
+    CONTENT_HASH_DIM = 2 ** 18
+    CONTENT_TOP_K = int(os.getenv('CONTENT_TOP_K', '20'))
+    CONTENT_BLOCK_SIZE = int(os.getenv('CONTENT_BLOCK_SIZE', '256'))
+    CONTENT_CANDIDATES = int(os.getenv('CONTENT_CANDIDATES', '200'))
+    CONTENT_QUEUE_SIZE = 1000
+    
+    # Response cache for hot read endpoints (TTL in seconds per route)
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '1000'))
+    RESPONSE_CACHE_DEFAULT_TTL = int(os.getenv('RESPONSE_CACHE_DEFAULT_TTL', '60'))
+    RESPONSE_CACHE_TTLS = {
+        'movies.trending': 60,
+        'movies.top_rated': 300,
+        'movies.genre': 120,
+        'movies.production_houses': 3600,
+        'movies.facets': 300,
+        'news.all': 60,
+        'news.latest': 60
+    }
+    
+    # Cache-Control for public GET endpoints: browser max-age and CDN s-maxage.
+    # Detail reads count views, so they stay private to keep the CDN from
+    # answering them
+    HTTP_CACHE_POLICIES = {
+        'movies.detail': {'max_age': 60, 'private': True},
+        'movies.list': {'max_age': 60, 's_maxage': 120},
+        'movies.search': {'max_age': 60, 's_maxage': 300},
+        'movies.suggest': {'max_age': 300, 's_maxage': 600},
+        'movies.reviews': {'max_age': 30, 's_maxage': 60},
+        'movies.production_houses': {'max_age': 3600, 's_maxage': 86400},
+        'news.detail': {'max_age': 60, 'private': True},
+        'news.list': {'max_age': 60, 's_maxage': 120},
+        'playlists.public': {'max_age': 60, 's_maxage': 120}
+    }
+    
+    # Title typeahead index
+    SUGGEST_MAX_RESULTS = 20
+    TITLE_INDEX_SYNC_INTERVAL = int(os.getenv('TITLE_INDEX_SYNC_INTERVAL', '30'))
+    TITLE_INDEX_REBUILD_INTERVAL = int(os.getenv('TITLE_INDEX_REBUILD_INTERVAL', '900'))
+    # Local-first search: pages of SEARCH_PAGE_SIZE (OMDb's page size); OMDb is
+    # only asked when fewer than SEARCH_MIN_LOCAL_RESULTS local matches exist
+    SEARCH_PAGE_SIZE = 10
+    SEARCH_LOCAL_LIMIT = int(os.getenv('SEARCH_LOCAL_LIMIT', '50'))
+    SEARCH_MIN_LOCAL_RESULTS = int(os.getenv('SEARCH_MIN_LOCAL_RESULTS', '5'))
+    FUZZY_MIN_SIMILARITY = float(os.getenv('FUZZY_MIN_SIMILARITY', '0.6'))
+    
+    # Query sampling for the index advisor
+    QUERY_SAMPLE_RATE = float(os.getenv('QUERY_SAMPLE_RATE', '0.05'))
+    QUERY_SAMPLE_TTL = 7 * 24 * 3600
+    
+    # Maximum number of movies accepted by one bulk ingest request
+    INGEST_MAX_ITEMS = int(os.getenv('INGEST_MAX_ITEMS', '5000'))
     
     # Production Houses
     PRODUCTION_HOUSES = [
@@ -53,3 +165,23 @@ class Config:
         'Toei Animation', 'Kyoto Animation', 'Wit Studio', 'MAPPA',
         'Trigger', 'Sunrise', 'Studio Pierrot', 'Silver Link'
     ]
+    
+    # Other names OMDb uses for the production houses above
+    PRODUCTION_HOUSE_ALIASES = {
+        'Marvel Studios': ['Marvel Entertainment', 'Marvel Enterprises'],
+        'Warner Bros. Pictures': ['Warner Bros', 'Warner Brothers', 'Warner Home Video'],
+        'Universal Pictures': ['Universal Studios'],
+        'Paramount Pictures': ['Paramount'],
+        '20th Century Studios': ['20th Century Fox', 'Twentieth Century Fox', '20th Century'],
+        'Columbia Pictures': ['Columbia TriStar'],
+        'Lionsgate Films': ['Lionsgate', 'Lions Gate'],
+        'Walt Disney Pictures': ['Walt Disney', 'Disney'],
+        'DreamWorks Pictures': ['DreamWorks', 'DreamWorks SKG'],
+        'A24 Films': ['A24'],
+        'Blumhouse Productions': ['Blumhouse'],
+        'Legendary Entertainment': ['Legendary Pictures'],
+        'MGM Studios': ['MGM', 'Metro-Goldwyn-Mayer'],
+        'Yash Raj Films': ['YRF'],
+        'Red Chillies Entertainment': ['Red Chillies'],
+        'Toho': ['Toho Company']
+    }
@@ -1,5 +1,6 @@
 from datetime import datetime
 from bson import ObjectId
+from services.pagination import paginate
 
 class Chat:
     """Chat model for the application"""
@@ -12,6 +13,7 @@ class Chat:
         """Create indexes for better query performance"""
         self.collection.create_index('user_id')
         self.collection.create_index('created_at')
+        self.collection.create_index([('updated_at', -1), ('_id', -1)])
     
     def create_chat(self, user_id):
         """Create a new chat conversation"""
@@ -50,12 +52,14 @@ class Chat:
         # Create new chat if doesn't exist
         return self.create_chat(user_id)
     
-    def get_all_chats(self, skip=0, limit=20):
-        """Get all chats (admin only)"""
-        chats = list(self.collection.find().sort('updated_at', -1).skip(skip).limit(limit))
+    def get_all_chats(self, skip=0, limit=20, cursor=None):
+        """Get a page of chats, most recently active first (admin only)"""
+        chats, next_cursor = paginate(
+            self.collection, {}, 'updated_at', -1, limit, cursor, skip
+        )
         for chat in chats:
             chat['_id'] = str(chat['_id'])
-        return chats
+        return chats, next_cursor
     
     def add_message(self, chat_id, sender_id, sender_role, message_text):
         """Add a message to chat"""
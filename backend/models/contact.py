@@ -1,5 +1,6 @@
 from datetime import datetime
 from bson import ObjectId
+from services.pagination import paginate
 
 class Contact:
     """Contact model for the application"""
@@ -11,7 +12,8 @@ class Contact:
     def _ensure_indexes(self):
         """Create indexes for better query performance"""
         self.collection.create_index('email')
-        self.collection.create_index('created_at')
+        self.collection.create_index([('created_at', -1), ('_id', -1)])
+        self.collection.create_index([('status', 1), ('created_at', -1), ('_id', -1)])
     
     def create_contact(self, name, email, subject, message):
         """Create a new contact submission"""
@@ -40,22 +42,24 @@ class Contact:
         except:
             return None
     
-    def get_all_contacts(self, skip=0, limit=20):
-        """Get all contact submissions"""
-        contacts = list(self.collection.find().sort('created_at', -1).skip(skip).limit(limit))
+    def get_all_contacts(self, skip=0, limit=20, cursor=None):
+        """Get a page of contact submissions, newest first"""
+        contacts, next_cursor = paginate(
+            self.collection, {}, 'created_at', -1, limit, cursor, skip
+        )
         for contact in contacts:
             contact['_id'] = str(contact['_id'])
-        return contacts
+        return contacts, next_cursor
     
-    def get_pending_contacts(self, skip=0, limit=20):
-        """Get pending contact submissions"""
-        contacts = list(self.collection.find(
-            {'status': 'pending'}
-        ).sort('created_at', -1).skip(skip).limit(limit))
+    def get_pending_contacts(self, skip=0, limit=20, cursor=None):
+        """Get a page of pending contact submissions"""
+        contacts, next_cursor = paginate(
+            self.collection, {'status': 'pending'}, 'created_at', -1, limit, cursor, skip
+        )
         
         for contact in contacts:
             contact['_id'] = str(contact['_id'])
-        return contacts
+        return contacts, next_cursor
     
     def update_contact_status(self, contact_id, status):
         """Update contact submission status"""
@@ -1,174 +1,460 @@
 from datetime import datetime
 from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from services.pagination import paginate
+from services.counter_buffer import CounterBuffer
+from services.response_cache import response_cache
+from services.title_index import title_index
+from services.content_similarity import ContentSimilarity
 
 class Movie:
     """Movie model for the application"""
     
+    # Public sort keys mapped to their typed, indexed fields
+    SORT_FIELDS = {
+        'year': 'year_start',
+        'imdb_rating': 'rating_num',
+        'rating': 'rating_num',
+        'imdb_votes': 'votes_num',
+        'runtime': 'runtime_min',
+        'box_office': 'box_office_usd',
+        'title': 'title',
+        'view_count': 'view_count'
+    }
+    
+    # Lightweight fields returned by list endpoints unless ?view=full
+    CARD_PROJECTION = {
+        'imdb_id': 1,
+        'title': 1,
+        'year': 1,
+        'poster': 1,
+        'genre': 1,
+        'imdb_rating': 1,
+        'production_house': 1
+    }
+    
+    # Compound indexes for the filter shapes the UI sends, laid out as
+    # equality fields, then the sort key (with _id for cursors), then ranges.
+    # genres and production_houses are both arrays and cannot share an index.
+    FILTER_INDEXES = [
+        [('production_houses', 1), ('year_start', -1), ('_id', -1), ('rating_num', 1)],
+        [('production_houses', 1), ('rating_num', -1), ('_id', -1), ('year_start', 1)],
+        [('genres', 1), ('year_start', -1), ('_id', -1), ('rating_num', 1)],
+        [('genres', 1), ('rating_num', -1), ('_id', -1), ('year_start', 1)],
+        [('year_start', -1), ('_id', -1), ('rating_num', 1)],
+        [('rating_num', -1), ('_id', -1), ('year_start', 1)]
+    ]
+    
+    # Filter keys each facet ignores, so its other values stay countable
+    FACET_FILTERS = {
+        'genres': ('genre',),
+        'decades': ('year_from', 'year_to'),
+        'production_houses': ('production_house',),
+        'rating_bands': ('rating_min',)
+    }
+    
+    # Lower bounds of the rating bands; the last band includes 10
+    RATING_BANDS = [0, 5, 6, 7, 8, 9]
+    
+    FACET_LIMIT = 50
+    
     def __init__(self, db):
         self.collection = db.movies
+        self.view_counter = CounterBuffer(self.collection, 'view_count')
+        response_cache.bind(db)
+        title_index.bind(db)
+        self.content_similarity = ContentSimilarity(db)
         self._ensure_indexes()
     
     def _ensure_indexes(self):
         """Create indexes for better query performance"""
         self.collection.create_index('imdb_id', unique=True)
         self.collection.create_index('title')
-        self.collection.create_index('year')
-        self.collection.create_index('production_house')
-        self.collection.create_index('genre')
+        self.collection.create_index('updated_at')
+        self.collection.create_index([('rating_num', -1), ('votes_num', -1)])
+        self.collection.create_index('box_office_usd')
+        self.collection.create_index('production_houses')
+        self.collection.create_index('genres')
+        self.collection.create_index('languages')
+        self.collection.create_index('countries')
+        
+        # Weighted full-text index for local search. OMDb's `language` field
+        # holds values like "English, Spanish", so it must not be read as the
+        # per-document language override.
+        self.collection.create_index(
+            [('title', 'text'), ('director', 'text'), ('actors', 'text'), ('plot', 'text')],
+            weights={'title': 10, 'director': 4, 'actors': 4, 'plot': 1},
+            name='movie_text_search',
+            default_language='english',
+            language_override='text_language'
+        )
+        
+        for keys in self.FILTER_INDEXES:
+            self.collection.create_index(keys)
+        
+        # Similar-movie candidates of a new movie: the most viewed sharing a
+        # genre or production house
+        self.collection.create_index([('genres', 1), ('view_count', -1), ('_id', 1)])
+        self.collection.create_index([('production_houses', 1), ('view_count', -1), ('_id', 1)])
     
     def create_movie(self, movie_data):
-        """Create or update a movie"""
-        # Check if movie already exists
-        existing = self.collection.find_one({'imdb_id': movie_data.get('imdb_id')})
+        """Create or update a movie in one atomic upsert"""
+        update = self._upsert_update(movie_data, datetime.utcnow())
+        
+        # Choosing the _id of a new movie up front lets the pre-image tell
+        # inserts (no pre-image) from updates in the same round trip
+        new_id = ObjectId()
+        update['$setOnInsert']['_id'] = new_id
         
-        if existing:
-            # Update existing movie
-            self.collection.update_one(
+        try:
+            previous = self.collection.find_one_and_update(
+                {'imdb_id': movie_data.get('imdb_id')},
+                update,
+                projection={'_id': 1},
+                upsert=True,
+                return_document=ReturnDocument.BEFORE
+            )
+        except DuplicateKeyError:
+            # A concurrent upsert inserted it first; this one now matches
+            previous = self.collection.find_one_and_update(
                 {'imdb_id': movie_data.get('imdb_id')},
-                {'$set': {**movie_data, 'updated_at': datetime.utcnow()}}
+                update,
+                projection={'_id': 1},
+                return_document=ReturnDocument.BEFORE
             )
-            return str(existing['_id'])
         
-        # Create new movie
-        movie_data['created_at'] = datetime.utcnow()
-        movie_data['updated_at'] = datetime.utcnow()
-        movie_data['ratings'] = []
-        movie_data['reviews'] = []
-        movie_data['view_count'] = 0
+        movie_id = previous['_id'] if previous else new_id
+        response_cache.invalidate('movies')
+        title_index.add({**movie_data, '_id': movie_id})
         
-        result = self.collection.insert_one(movie_data)
-        return str(result.inserted_id)
+        # New movies get similar movies in the background until the next full build
+        if previous is None:
+            self.content_similarity.place_later({**movie_data, '_id': movie_id})
+        
+        return str(movie_id)
+    
+    def create_movies(self, movies):
+        """Create or update many movies, returning their IDs in order"""
+        return [outcome.get('_id') for outcome in self.bulk_upsert_movies(movies)]
+    
+    def _upsert_update(self, movie_data, now):
+        """Build the upsert update for a movie keyed on imdb_id"""
+        on_insert = {
+            'created_at': now,
+            'view_count': 0,
+            'review_count': 0
+        }
+        
+        # $set and $setOnInsert may not touch the same field
+        on_insert = {k: v for k, v in on_insert.items() if k not in movie_data}
+        
+        return {
+            '$set': {**movie_data, 'updated_at': now},
+            '$setOnInsert': on_insert
+        }
+    
+    def bulk_upsert_movies(self, movies, batch_size=500):
+        """Upsert many movies keyed on imdb_id with unordered bulk writes"""
+        outcomes = []
+        for start in range(0, len(movies), batch_size):
+            outcomes.extend(self._upsert_batch(movies[start:start + batch_size]))
+        
+        if outcomes:
+            response_cache.invalidate('movies')
+        for movie, outcome in zip(movies, outcomes):
+            if outcome.get('_id'):
+                title_index.add({**movie, '_id': outcome['_id']})
+        return outcomes
+    
+    def _upsert_batch(self, batch):
+        """Upsert one batch and report an outcome per movie"""
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne({'imdb_id': movie['imdb_id']}, self._upsert_update(movie, now), upsert=True)
+            for movie in batch
+        ]
+        
+        errors = {}
+        try:
+            result = self.collection.bulk_write(operations, ordered=False)
+            upserted = result.upserted_ids
+        except BulkWriteError as e:
+            upserted = {item['index']: item['_id'] for item in e.details.get('upserted', [])}
+            errors = {item['index']: item.get('errmsg') for item in e.details.get('writeErrors', [])}
+        
+        # Updated movies keep their existing _id, so look those up in one query
+        updated = [
+            movie['imdb_id'] for index, movie in enumerate(batch)
+            if index not in upserted and index not in errors
+        ]
+        existing_ids = {}
+        if updated:
+            for doc in self.collection.find({'imdb_id': {'$in': updated}}, {'imdb_id': 1}):
+                existing_ids[doc['imdb_id']] = str(doc['_id'])
+        
+        outcomes = []
+        for index, movie in enumerate(batch):
+            outcome = {'imdb_id': movie['imdb_id']}
+            if index in errors:
+                outcome['status'] = 'failed'
+                outcome['error'] = errors[index]
+            elif index in upserted:
+                outcome['status'] = 'inserted'
+                outcome['_id'] = str(upserted[index])
+            else:
+                outcome['status'] = 'updated'
+                outcome['_id'] = existing_ids.get(movie['imdb_id'])
+            outcomes.append(outcome)
+        
+        return outcomes
+    
+    def get_existing_imdb_ids(self, imdb_ids):
+        """Get the subset of IMDb IDs already stored in the catalog"""
+        docs = self.collection.find({'imdb_id': {'$in': list(imdb_ids)}}, {'imdb_id': 1})
+        return {doc['imdb_id'] for doc in docs}
     
     def get_movie_by_id(self, movie_id):
         """Get movie by ID"""
         try:
-            movie = self.collection.find_one({'_id': ObjectId(movie_id)})
+            # Reviews and similar movies are served by their own endpoints;
+            # skip reviews not yet migrated out
+            movie = self.collection.find_one({'_id': ObjectId(movie_id)}, {'reviews': 0, 'similar': 0})
             if movie:
                 movie['_id'] = str(movie['_id'])
             return movie
         except:
             return None
     
+    def get_movie_version(self, movie_id):
+        """Get the fields that change a movie's detail response, or None if it does not exist"""
+        if not ObjectId.is_valid(movie_id):
+            return None
+        return self.collection.find_one({'_id': ObjectId(movie_id)}, {
+            'updated_at': 1,
+            'view_count': 1,
+            'rating_count': 1,
+            'rating_sum': 1,
+            'review_count': 1
+        })
+    
     def get_movie_by_imdb_id(self, imdb_id):
         """Get movie by IMDb ID"""
-        movie = self.collection.find_one({'imdb_id': imdb_id})
+        movie = self.collection.find_one({'imdb_id': imdb_id}, {'similar': 0})
         if movie:
             movie['_id'] = str(movie['_id'])
         return movie
     
-    def search_movies(self, query, skip=0, limit=20):
-        """Search movies by title"""
+    def projection_for(self, view):
+        """Get the projection for a list view: card by default, all but `similar` for full"""
+        return {'similar': 0} if view == 'full' else self.CARD_PROJECTION
+    
+    def search_movies(self, query, skip=0, limit=20, projection=None, filters=None):
+        """Search movies by relevance, breaking ties by popularity"""
         movies = list(self.collection.find(
-            {'title': {'$regex': query, '$options': 'i'}}
-        ).skip(skip).limit(limit))
+            {'$text': {'$search': query}, **(filters or {})},
+            {**(projection or {}), 'score': {'$meta': 'textScore'}}
+        ).sort([
+            ('score', {'$meta': 'textScore'}),
+            ('view_count', -1)
+        ]).skip(skip).limit(limit))
         
         for movie in movies:
             movie['_id'] = str(movie['_id'])
         return movies
     
-    def get_movies_by_production_house(self, production_house, skip=0, limit=20, sort_by='year'):
-        """Get movies by production house"""
-        sort_order = -1 if sort_by == 'year' else -1
+    def _sort_field(self, sort_by):
+        """Resolve a public sort key to its indexed field"""
+        return self.SORT_FIELDS.get(sort_by, 'year_start')
+    
+    def get_movies_by_production_house(self, production_house, skip=0, limit=20, sort_by='year',
+                                       cursor=None, projection=None):
+        """Get a page of movies by production house"""
+        sort_field = self._sort_field(sort_by)
+        sort_order = 1 if sort_field == 'title' else -1
         
-        movies = list(self.collection.find(
-            {'production_house': production_house}
-        ).sort(sort_by, sort_order).skip(skip).limit(limit))
+        movies, next_cursor = paginate(
+            self.collection, {'production_houses': production_house},
+            sort_field, sort_order, limit, cursor, skip, projection
+        )
         
         for movie in movies:
             movie['_id'] = str(movie['_id'])
-        return movies
+        return movies, next_cursor
     
-    def get_movies_by_genre(self, genre, skip=0, limit=20):
-        """Get movies by genre"""
-        movies = list(self.collection.find(
-            {'genre': {'$regex': genre, '$options': 'i'}}
-        ).skip(skip).limit(limit))
+    def get_movies_by_genre(self, genre, skip=0, limit=20, sort_by='year', cursor=None,
+                            projection=None):
+        """Get a page of movies by genre"""
+        sort_field = self._sort_field(sort_by)
+        sort_order = 1 if sort_field == 'title' else -1
+        
+        movies, next_cursor = paginate(
+            self.collection, {'genres': genre.strip().lower()},
+            sort_field, sort_order, limit, cursor, skip, projection
+        )
         
         for movie in movies:
             movie['_id'] = str(movie['_id'])
-        return movies
+        return movies, next_cursor
     
-    def get_trending_movies(self, limit=10):
-        """Get trending movies (most viewed)"""
-        movies = list(self.collection.find().sort('view_count', -1).limit(limit))
+    def get_movies_by_ids(self, movie_ids, projection=None):
+        """Get movies by ID, in the order the IDs were given"""
+        object_ids = [ObjectId(movie_id) for movie_id in movie_ids if ObjectId.is_valid(movie_id)]
+        movies = {}
+        for movie in self.collection.find({'_id': {'$in': object_ids}}, projection):
+            movie['_id'] = str(movie['_id'])
+            movies[movie['_id']] = movie
+        return [movies[movie_id] for movie_id in movie_ids if movie_id in movies]
+    
+    def get_similar_movies(self, movie_id, limit=10):
+        """Get a movie's stored similar-movie cards, or None if the movie does not exist"""
+        if not ObjectId.is_valid(movie_id):
+            return None
+        movie = self.collection.find_one(
+            {'_id': ObjectId(movie_id)},
+            {'_id': 1, 'similar': {'$slice': limit}}
+        )
+        if not movie:
+            return None
+        return movie.get('similar', [])
+    
+    def get_trending_movies(self, limit=10, projection=None, query=None):
+        """Get the most viewed movies of all time, optionally within a query"""
+        movies = list(self.collection.find(query or {}, projection).sort('view_count', -1).limit(limit))
         for movie in movies:
             movie['_id'] = str(movie['_id'])
         return movies
     
-    def get_top_rated_movies(self, limit=10):
+    def get_top_rated_movies(self, limit=10, projection=None):
         """Get top rated movies"""
-        movies = list(self.collection.find().sort('imdb_rating', -1).limit(limit))
+        movies = list(self.collection.find(
+            {'rating_num': {'$ne': None}}, projection
+        ).sort([('rating_num', -1), ('votes_num', -1)]).limit(limit))
         for movie in movies:
             movie['_id'] = str(movie['_id'])
         return movies
     
-    def filter_movies(self, filters, skip=0, limit=20):
-        """Filter movies by multiple criteria"""
+    def build_filter(self, filters):
+        """Translate filter criteria into a query, sort field and sort order"""
         query = {}
         
         if filters.get('production_house'):
-            query['production_house'] = filters['production_house']
+            query['production_houses'] = filters['production_house']
         
         if filters.get('genre'):
-            query['genre'] = {'$regex': filters['genre'], '$options': 'i'}
+            query['genres'] = filters['genre'].strip().lower()
+        
+        if filters.get('language'):
+            query['languages'] = filters['language'].strip().lower()
+        
+        if filters.get('country'):
+            query['countries'] = filters['country'].strip().lower()
         
         if filters.get('year_from') or filters.get('year_to'):
-            query['year'] = {}
+            query['year_start'] = {}
             if filters.get('year_from'):
-                query['year']['$gte'] = filters['year_from']
+                query['year_start']['$gte'] = int(filters['year_from'])
             if filters.get('year_to'):
-                query['year']['$lte'] = filters['year_to']
+                query['year_start']['$lte'] = int(filters['year_to'])
         
         if filters.get('rating_min'):
-            query['imdb_rating'] = {'$gte': float(filters['rating_min'])}
+            query['rating_num'] = {'$gte': float(filters['rating_min'])}
         
-        sort_by = filters.get('sort_by', 'year')
+        sort_field = self._sort_field(filters.get('sort_by', 'year'))
         sort_order = -1 if filters.get('sort_order', 'desc') == 'desc' else 1
         
-        movies = list(self.collection.find(query).sort(sort_by, sort_order).skip(skip).limit(limit))
+        return query, sort_field, sort_order
+    
+    def filter_movies(self, filters, skip=0, limit=20, cursor=None, projection=None):
+        """Get a page of movies matching multiple criteria"""
+        query, sort_field, sort_order = self.build_filter(filters)
+        
+        movies, next_cursor = paginate(
+            self.collection, query, sort_field, sort_order, limit, cursor, skip, projection
+        )
         
         for movie in movies:
             movie['_id'] = str(movie['_id'])
-        return movies
-    
-    def increment_view_count(self, movie_id):
-        """Increment movie view count"""
-        self.collection.update_one(
-            {'_id': ObjectId(movie_id)},
-            {'$inc': {'view_count': 1}}
-        )
+        return movies, next_cursor
     
-    def add_rating(self, movie_id, user_id, rating):
-        """Add user rating to movie"""
-        self.collection.update_one(
-            {'_id': ObjectId(movie_id)},
-            {
-                '$push': {
-                    'ratings': {
-                        'user_id': user_id,
-                        'rating': rating,
-                        'created_at': datetime.utcnow()
-                    }
-                }
-            }
-        )
+    def get_facets(self, filters):
+        """Count genres, decades, production houses and rating bands in one aggregation
+        
+        Each facet applies every filter except its own, so selecting a
+        genre still shows how many movies the other genres have.
+        """
+        facet_keys = {key for keys in self.FACET_FILTERS.values() for key in keys}
+        base = {k: v for k, v in filters.items() if k not in facet_keys}
+        
+        def match(excluded=()):
+            own = {k: v for k, v in filters.items() if k in facet_keys and k not in excluded}
+            return {'$match': self.build_filter(own)[0]}
+        
+        def top_values(field, excluded):
+            return [
+                match(excluded),
+                {'$unwind': f'${field}'},
+                {'$match': {field: {'$nin': [None, '', 'N/A']}}},
+                {'$sortByCount': f'${field}'},
+                {'$limit': self.FACET_LIMIT}
+            ]
+        
+        pipeline = [
+            # Criteria no facet ignores narrow the set once, using the indexes
+            {'$match': self.build_filter(base)[0]},
+            {'$facet': {
+                'total': [match(), {'$count': 'count'}],
+                'genres': top_values('genres', self.FACET_FILTERS['genres']),
+                'production_houses': top_values('production_houses', self.FACET_FILTERS['production_houses']),
+                'decades': [
+                    match(self.FACET_FILTERS['decades']),
+                    {'$match': {'year_start': {'$type': 'number'}}},
+                    {'$group': {
+                        '_id': {'$subtract': ['$year_start', {'$mod': ['$year_start', 10]}]},
+                        'count': {'$sum': 1}
+                    }},
+                    {'$sort': {'_id': -1}}
+                ],
+                'rating_bands': [
+                    match(self.FACET_FILTERS['rating_bands']),
+                    {'$bucket': {
+                        'groupBy': '$rating_num',
+                        'boundaries': self.RATING_BANDS + [10.01],
+                        'default': 'unrated',
+                        'output': {'count': {'$sum': 1}}
+                    }}
+                ]
+            }}
+        ]
+        
+        facets = next(self.collection.aggregate(pipeline))
+        bands = dict(zip(self.RATING_BANDS, self.RATING_BANDS[1:] + [10]))
+        
+        return {
+            'total': facets['total'][0]['count'] if facets['total'] else 0,
+            'genres': [{'value': f['_id'], 'count': f['count']} for f in facets['genres']],
+            'production_houses': [
+                {'value': f['_id'], 'count': f['count']} for f in facets['production_houses']
+            ],
+            'decades': [{'value': int(f['_id']), 'count': f['count']} for f in facets['decades']],
+            'rating_bands': [
+                {'min': f['_id'], 'max': bands.get(f['_id']), 'count': f['count']}
+                for f in facets['rating_bands']
+            ]
+        }
     
-    def add_review(self, movie_id, user_id, review_text):
-        """Add user review to movie"""
-        self.collection.update_one(
-            {'_id': ObjectId(movie_id)},
-            {
-                '$push': {
-                    'reviews': {
-                        'user_id': user_id,
-                        'review': review_text,
-                        'created_at': datetime.utcnow()
-                    }
-                }
-            }
-        )
+    def increment_view_count(self, movie_id):
+        """Increment movie view count (buffered and written in batches)"""
+        self.view_counter.increment(movie_id)
     
     def delete_movie(self, movie_id):
         """Delete a movie"""
         result = self.collection.delete_one({'_id': ObjectId(movie_id)})
+        # Other movies' similar lists must not link to it
+        self.collection.update_many(
+            {'similar.movie_id': str(movie_id)},
+            {'$pull': {'similar': {'movie_id': str(movie_id)}}}
+        )
+        title_index.remove(movie_id)
+        response_cache.invalidate('movies')
         return result.deleted_count > 0
@@ -1,17 +1,22 @@
 from datetime import datetime
 from bson import ObjectId
+from services.pagination import paginate
+from services.counter_buffer import CounterBuffer
+from services.response_cache import response_cache
 
 class News:
     """News model for the application"""
     
     def __init__(self, db):
         self.collection = db.news
+        self.view_counter = CounterBuffer(self.collection, 'views')
+        response_cache.bind(db)
         self._ensure_indexes()
     
     def _ensure_indexes(self):
         """Create indexes for better query performance"""
-        self.collection.create_index('created_at')
-        self.collection.create_index('category')
+        self.collection.create_index([('created_at', -1), ('_id', -1)])
+        self.collection.create_index([('category', 1), ('created_at', -1), ('_id', -1)])
     
     def create_news(self, title, content, category, author_id, image=''):
         """Create a new news article"""
@@ -28,6 +33,7 @@ class News:
         
         result = self.collection.insert_one(news_data)
         news_data['_id'] = str(result.inserted_id)
+        response_cache.invalidate('news')
         
         return news_data
     
@@ -41,22 +47,30 @@ class News:
         except:
             return None
     
-    def get_all_news(self, skip=0, limit=20):
-        """Get all news articles"""
-        news_list = list(self.collection.find().sort('created_at', -1).skip(skip).limit(limit))
+    def get_news_version(self, news_id):
+        """Get the fields that change an article's response, or None if it does not exist"""
+        if not ObjectId.is_valid(news_id):
+            return None
+        return self.collection.find_one({'_id': ObjectId(news_id)}, {'updated_at': 1, 'views': 1})
+    
+    def get_all_news(self, skip=0, limit=20, cursor=None):
+        """Get a page of news articles, newest first"""
+        news_list, next_cursor = paginate(
+            self.collection, {}, 'created_at', -1, limit, cursor, skip
+        )
         for news in news_list:
             news['_id'] = str(news['_id'])
-        return news_list
+        return news_list, next_cursor
     
-    def get_news_by_category(self, category, skip=0, limit=20):
-        """Get news by category"""
-        news_list = list(self.collection.find(
-            {'category': category}
-        ).sort('created_at', -1).skip(skip).limit(limit))
+    def get_news_by_category(self, category, skip=0, limit=20, cursor=None):
+        """Get a page of news by category"""
+        news_list, next_cursor = paginate(
+            self.collection, {'category': category}, 'created_at', -1, limit, cursor, skip
+        )
         
         for news in news_list:
             news['_id'] = str(news['_id'])
-        return news_list
+        return news_list, next_cursor
     
     def get_latest_news(self, limit=5):
         """Get latest news articles"""
@@ -75,30 +89,29 @@ class News:
         )
         
         if result.modified_count > 0:
+            response_cache.invalidate('news')
             return self.get_news_by_id(news_id)
         return None
     
     def delete_news(self, news_id):
         """Delete a news article"""
         result = self.collection.delete_one({'_id': ObjectId(news_id)})
+        response_cache.invalidate('news')
         return result.deleted_count > 0
     
     def increment_views(self, news_id):
-        """Increment news article views"""
-        self.collection.update_one(
-            {'_id': ObjectId(news_id)},
-            {'$inc': {'views': 1}}
-        )
+        """Increment news article views (buffered and written in batches)"""
+        self.view_counter.increment(news_id)
     
-    def search_news(self, query, skip=0, limit=20):
-        """Search news by title or content"""
-        news_list = list(self.collection.find({
+    def search_news(self, query, skip=0, limit=20, cursor=None):
+        """Search a page of news by title or content"""
+        news_list, next_cursor = paginate(self.collection, {
             '$or': [
                 {'title': {'$regex': query, '$options': 'i'}},
                 {'content': {'$regex': query, '$options': 'i'}}
             ]
-        }).sort('created_at', -1).skip(skip).limit(limit))
+        }, 'created_at', -1, limit, cursor, skip)
         
         for news in news_list:
             news['_id'] = str(news['_id'])
-        return news_list
+        return news_list, next_cursor
@@ -1,5 +1,6 @@
 from datetime import datetime
 from bson import ObjectId
+from services.pagination import paginate
 
 class Playlist:
     """Playlist model for the application"""
@@ -12,6 +13,7 @@ class Playlist:
         """Create indexes for better query performance"""
         self.collection.create_index('user_id')
         self.collection.create_index('name')
+        self.collection.create_index([('is_public', 1), ('_id', -1)])
     
     def create_playlist(self, user_id, name, description='', is_public=True):
         """Create a new playlist"""
@@ -48,12 +50,14 @@ class Playlist:
             playlist['_id'] = str(playlist['_id'])
         return playlists
     
-    def get_public_playlists(self, skip=0, limit=20):
-        """Get all public playlists"""
-        playlists = list(self.collection.find({'is_public': True}).skip(skip).limit(limit))
+    def get_public_playlists(self, skip=0, limit=20, cursor=None):
+        """Get a page of public playlists, newest first"""
+        playlists, next_cursor = paginate(
+            self.collection, {'is_public': True}, '_id', -1, limit, cursor, skip
+        )
         for playlist in playlists:
             playlist['_id'] = str(playlist['_id'])
-        return playlists
+        return playlists, next_cursor
     
     def update_playlist(self, playlist_id, update_data):
         """Update playlist information"""
@@ -0,0 +1,136 @@
+from datetime import datetime
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+class Rating:
+    """Per-user movie ratings, one document per (movie, user)
+    
+    The movie keeps running rating_count, rating_sum, rating_avg and a
+    10-bucket rating_histogram so reads never have to scan the ratings.
+    """
+    
+    HISTOGRAM_BUCKETS = 10
+    
+    def __init__(self, db):
+        self.collection = db.movie_ratings
+        self.movies = db.movies
+        self._ensure_indexes()
+    
+    def _ensure_indexes(self):
+        """Create indexes for better query performance"""
+        self.collection.create_index([('movie_id', 1), ('user_id', 1)], unique=True)
+        self.collection.create_index([('user_id', 1), ('updated_at', -1)])
+    
+    @classmethod
+    def bucket_for(cls, rating):
+        """Histogram bucket for a 0-10 rating: [0, 1) is '0', ..., [9, 10] is '9'"""
+        return str(min(int(rating), cls.HISTOGRAM_BUCKETS - 1))
+    
+    def rate(self, movie_id, user_id, rating):
+        """Set a user's rating for a movie, returning the movie's new aggregates
+        
+        Returns None when the movie does not exist.
+        """
+        if not ObjectId.is_valid(movie_id) or not self.movies.count_documents(
+            {'_id': ObjectId(movie_id)}, limit=1
+        ):
+            return None
+        
+        now = datetime.utcnow()
+        query = {'movie_id': movie_id, 'user_id': user_id}
+        update = {
+            '$set': {'rating': rating, 'updated_at': now},
+            '$setOnInsert': {'created_at': now}
+        }
+        
+        # The previous rating tells us how to adjust the movie's aggregates
+        try:
+            previous = self.collection.find_one_and_update(
+                query, update, projection={'rating': 1}, upsert=True,
+                return_document=ReturnDocument.BEFORE
+            )
+        except DuplicateKeyError:
+            # A concurrent first rating by the same user inserted it first
+            previous = self.collection.find_one_and_update(
+                query, update, projection={'rating': 1},
+                return_document=ReturnDocument.BEFORE
+            )
+        
+        old_rating = previous.get('rating') if previous else None
+        return self._apply(movie_id, rating, old_rating)
+    
+    def _apply(self, movie_id, rating, old_rating=None):
+        """Atomically fold a new or changed rating into the movie's aggregates"""
+        histogram = {self.bucket_for(rating): 1}
+        if old_rating is not None:
+            old_bucket = self.bucket_for(old_rating)
+            histogram[old_bucket] = histogram.get(old_bucket, 0) - 1
+        
+        def add(field, amount):
+            return {'$add': [{'$ifNull': [f'${field}', 0]}, amount]}
+        
+        changes = {
+            'rating_count': add('rating_count', 0 if old_rating is not None else 1),
+            'rating_sum': add('rating_sum', rating - (old_rating or 0))
+        }
+        for bucket, amount in histogram.items():
+            changes[f'rating_histogram.{bucket}'] = add(f'rating_histogram.{bucket}', amount)
+        
+        movie = self.movies.find_one_and_update(
+            {'_id': ObjectId(movie_id)},
+            [
+                {'$set': changes},
+                {'$set': {'rating_avg': {'$round': [
+                    {'$divide': ['$rating_sum', '$rating_count']}, 2
+                ]}}}
+            ],
+            projection={'rating_count': 1, 'rating_avg': 1, 'rating_histogram': 1, '_id': 0},
+            return_document=ReturnDocument.AFTER
+        )
+        return movie
+    
+    def get_user_rating(self, movie_id, user_id):
+        """Get a user's rating for a movie, or None"""
+        rating = self.collection.find_one(
+            {'movie_id': movie_id, 'user_id': user_id},
+            {'rating': 1}
+        )
+        return rating['rating'] if rating else None
+    
+    def get_user_ratings(self, user_id, movie_ids):
+        """Get a user's ratings for many movies as {movie_id: rating}"""
+        ratings = self.collection.find(
+            {'user_id': user_id, 'movie_id': {'$in': list(movie_ids)}},
+            {'movie_id': 1, 'rating': 1, '_id': 0}
+        )
+        return {rating['movie_id']: rating['rating'] for rating in ratings}
+    
+    def recompute_aggregates(self, movie_id):
+        """Rebuild a movie's rating aggregates from the ratings collection"""
+        buckets = self.collection.aggregate([
+            {'$match': {'movie_id': movie_id}},
+            {'$group': {
+                '_id': {'$min': [{'$floor': '$rating'}, self.HISTOGRAM_BUCKETS - 1]},
+                'count': {'$sum': 1},
+                'sum': {'$sum': '$rating'}
+            }}
+        ])
+        
+        count = 0
+        total = 0
+        histogram = {}
+        for bucket in buckets:
+            histogram[str(int(bucket['_id']))] = bucket['count']
+            count += bucket['count']
+            total += bucket['sum']
+        
+        self.movies.update_one(
+            {'_id': ObjectId(movie_id)},
+            {'$set': {
+                'rating_count': count,
+                'rating_sum': total,
+                'rating_avg': round(total / count, 2) if count else None,
+                'rating_histogram': histogram
+            }}
+        )
@@ -0,0 +1,67 @@
+from datetime import datetime
+from bson import ObjectId
+from services.pagination import paginate
+
+class Review:
+    """Movie reviews, stored apart from the movie so they can be paged"""
+    
+    def __init__(self, db):
+        self.collection = db.reviews
+        self.movies = db.movies
+        self._ensure_indexes()
+    
+    def _ensure_indexes(self):
+        """Create indexes for better query performance"""
+        self.collection.create_index([('movie_id', 1), ('created_at', -1), ('_id', -1)])
+        self.collection.create_index([('user_id', 1), ('created_at', -1), ('_id', -1)])
+    
+    def create_review(self, movie_id, user_id, review_text):
+        """Add a review and bump the movie's review_count
+        
+        Returns None when the movie does not exist.
+        """
+        if not ObjectId.is_valid(movie_id):
+            return None
+        
+        if not self.movies.find_one({'_id': ObjectId(movie_id)}, {'_id': 1}):
+            return None
+        
+        review_data = {
+            'movie_id': movie_id,
+            'user_id': user_id,
+            'review': review_text,
+            'created_at': datetime.utcnow()
+        }
+        
+        # Count the review only once it is stored; a movie deleted in between
+        # leaves no orphaned review behind
+        result = self.collection.insert_one(review_data)
+        counted = self.movies.update_one(
+            {'_id': ObjectId(movie_id)},
+            {'$inc': {'review_count': 1}}
+        )
+        if counted.matched_count == 0:
+            self.collection.delete_one({'_id': result.inserted_id})
+            return None
+        
+        review_data['_id'] = str(result.inserted_id)
+        
+        return review_data
+    
+    def get_movie_reviews(self, movie_id, skip=0, limit=20, cursor=None):
+        """Get a page of reviews for a movie, newest first"""
+        reviews, next_cursor = paginate(
+            self.collection, {'movie_id': movie_id}, 'created_at', -1, limit, cursor, skip
+        )
+        for review in reviews:
+            review['_id'] = str(review['_id'])
+        return reviews, next_cursor
+    
+    def get_user_reviews(self, user_id, skip=0, limit=20, cursor=None):
+        """Get a page of a user's reviews, newest first"""
+        reviews, next_cursor = paginate(
+            self.collection, {'user_id': user_id}, 'created_at', -1, limit, cursor, skip
+        )
+        for review in reviews:
+            review['_id'] = str(review['_id'])
+        return reviews, next_cursor
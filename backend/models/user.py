@@ -1,6 +1,7 @@
 from datetime import datetime
 from bson import ObjectId
 import bcrypt
+from services.pagination import paginate
 
 class User:
     """User model for the application"""
@@ -94,13 +95,15 @@ class User:
         result = self.collection.delete_one({'_id': ObjectId(user_id)})
         return result.deleted_count > 0
     
-    def get_all_users(self, skip=0, limit=20):
-        """Get all users (admin only)"""
-        users = list(self.collection.find().skip(skip).limit(limit))
+    def get_all_users(self, skip=0, limit=20, cursor=None):
+        """Get a page of users, newest first (admin only)"""
+        users, next_cursor = paginate(
+            self.collection, {}, '_id', -1, limit, cursor, skip,
+            projection={'password': 0}
+        )
         for user in users:
             user['_id'] = str(user['_id'])
-            user.pop('password', None)
-        return users
+        return users, next_cursor
     
     def add_to_favorites(self, user_id, movie_id):
         """Add movie to user's favorites"""
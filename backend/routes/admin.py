@@ -1,12 +1,23 @@
+import threading
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt
 from services.movie_seeder import MovieSeeder
 from services.news_service import NewsService
+from services.pagination import InvalidCursor, page_args, page_response
+from models.user import User
+from services.omdb_service import omdb_cache
+from services.http_client import get_pool_stats
+from services.backfill import CATALOG_BACKFILL, BackfillRunner, backfill_catalog, clamp_batch_size
+from services.index_advisor import IndexAdvisor
+from services.trending_service import TrendingService
+from services.response_cache import response_cache
 
 admin_bp = Blueprint('admin', __name__)
 
 def init_admin_routes(db):
     """Initialize admin routes with database"""
+    user_model = User(db)
+    backfill_jobs = {}
     
     @admin_bp.route('/seed-movies', methods=['POST'])
     @jwt_required()
@@ -36,6 +47,7 @@ def init_admin_routes(db):
                 added = seeder.quick_seed()
                 result = {'success': True, 'total_added': added}
             
+            response_cache.invalidate('movies')
             return jsonify(result), 200
             
         except Exception as e:
@@ -53,6 +65,7 @@ def init_admin_routes(db):
             
             news_service = NewsService(db)
             added = news_service.seed_news()
+            response_cache.invalidate('news')
             
             return jsonify({
                 'success': True,
@@ -74,6 +87,7 @@ def init_admin_routes(db):
             
             news_service = NewsService(db)
             result = news_service.refresh_news()
+            response_cache.invalidate('news')
             
             return jsonify({
                 'success': True,
@@ -108,6 +122,163 @@ def init_admin_routes(db):
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     
+    @admin_bp.route('/users', methods=['GET'])
+    @jwt_required()
+    def get_all_users():
+        """Get a page of users (Admin only)"""
+        try:
+            # Check if user is admin
+            claims = get_jwt()
+            if claims.get('role') != 'admin':
+                return jsonify({'error': 'Admin access required'}), 403
+            
+            skip, limit, cursor = page_args(20)
+            
+            users, next_cursor = user_model.get_all_users(skip, limit, cursor)
+            return page_response(users, next_cursor), 200
+            
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
+    @admin_bp.route('/omdb-cache', methods=['GET'])
+    @jwt_required()
+    def get_omdb_cache_stats():
+        """Get OMDb response cache hit/miss counts (Admin only)"""
+        try:
+            # Check if user is admin
+            claims = get_jwt()
+            if claims.get('role') != 'admin':
+                return jsonify({'error': 'Admin access required'}), 403
+            
+            return jsonify(omdb_cache.get_stats()), 200
+            
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
+    @admin_bp.route('/response-cache', methods=['GET'])
+    @jwt_required()
+    def get_response_cache_stats():
+        """Get response cache hit ratio per route (Admin only)"""
+        try:
+            # Check if user is admin
+            claims = get_jwt()
+            if claims.get('role') != 'admin':
+                return jsonify({'error': 'Admin access required'}), 403
+            
+            return jsonify(response_cache.get_stats()), 200
+            
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
+    @admin_bp.route('/http-pools', methods=['GET'])
+    @jwt_required()
+    def get_http_pool_stats():
+        """Get outbound HTTP connection pool stats (Admin only)"""
+        try:
+            # Check if user is admin
+            claims = get_jwt()
+            if claims.get('role') != 'admin':
+                return jsonify({'error': 'Admin access required'}), 403
+            
+            return jsonify(get_pool_stats()), 200
+            
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
+    @admin_bp.route('/backfill/catalog-fields', methods=['POST'])
+    @jwt_required()
+    def backfill_catalog_fields():
+        """Start recomputing normalized catalog fields in the background (Admin only)"""
+        try:
+            # Check if user is admin
+            claims = get_jwt()
+            if claims.get('role') != 'admin':
+                return jsonify({'error': 'Admin access required'}), 403
+            
+            data = request.get_json(silent=True) or {}
+            try:
+                batch_size = clamp_batch_size(data.get('batch_size', 500))
+            except (TypeError, ValueError):
+                return jsonify({'error': 'batch_size must be an integer'}), 400
+            
+            job = backfill_jobs.get(CATALOG_BACKFILL)
+            if job and job.is_alive():
+                return jsonify({
+                    'error': 'Backfill already running',
+                    'status': BackfillRunner(db).get_status(CATALOG_BACKFILL)
+                }), 409
+            
+            def run():
+                try:
+                    backfill_catalog(db, batch_size, bool(data.get('restart', False)))
+                except Exception as e:
+                    print(f"Error backfilling catalog fields: {str(e)}")
+            
+            job = threading.Thread(target=run, daemon=True)
+            backfill_jobs[CATALOG_BACKFILL] = job
+            job.start()
+            
+            return jsonify({'success': True, 'started': True, 'batch_size': batch_size}), 202
+            
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
+    @admin_bp.route('/backfill/catalog-fields', methods=['GET'])
+    @jwt_required()
+    def get_catalog_backfill_status():
+        """Get progress of the catalog fields backfill (Admin only)"""
+        try:
+            # Check if user is admin
+            claims = get_jwt()
+            if claims.get('role') != 'admin':
+                return jsonify({'error': 'Admin access required'}), 403
+            
+            job = backfill_jobs.get(CATALOG_BACKFILL)
+            return jsonify({
+                'running': bool(job and job.is_alive()),
+                'status': BackfillRunner(db).get_status(CATALOG_BACKFILL)
+            }), 200
+            
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
+    @admin_bp.route('/index-advisor', methods=['GET'])
+    @jwt_required()
+    def get_index_advice():
+        """Explain sampled filter queries to find missing indexes (Admin only)"""
+        try:
+            # Check if user is admin
+            claims = get_jwt()
+            if claims.get('role') != 'admin':
+                return jsonify({'error': 'Admin access required'}), 403
+            
+            sample_size = request.args.get('samples', 500, type=int)
+            report = IndexAdvisor(db).report('movies', sample_size)
+            
+            return jsonify(report), 200
+            
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
+    @admin_bp.route('/trending/refresh', methods=['POST'])
+    @jwt_required()
+    def refresh_trending():
+        """Recompute trending lists now (Admin only)"""
+        try:
+            # Check if user is admin
+            claims = get_jwt()
+            if claims.get('role') != 'admin':
+                return jsonify({'error': 'Admin access required'}), 403
+            
+            result = TrendingService(db).compute()
+            
+            return jsonify({'success': True, **result}), 200
+            
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
     @admin_bp.route('/clear-movies', methods=['DELETE'])
     @jwt_required()
     def clear_movies():
@@ -120,6 +291,7 @@ def init_admin_routes(db):
             
             movies_collection = db['movie_platform']['movies']
             result = movies_collection.delete_many({'seeded': True})
+            response_cache.invalidate('movies')
             
             return jsonify({
                 'success': True,
@@ -141,6 +313,7 @@ def init_admin_routes(db):
             
             news_collection = db['movie_platform']['news']
             result = news_collection.delete_many({'auto_fetched': True})
+            response_cache.invalidate('news')
             
             return jsonify({
                 'success': True,
@@ -175,6 +348,7 @@ def init_admin_routes(db):
             # Seed news
             news_service = NewsService(db)
             news_added = news_service.seed_news()
+            response_cache.invalidate('movies', 'news')
             
             return jsonify({
                 'success': True,
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from models.chat import Chat
+from services.pagination import InvalidCursor, page_args, page_response
 
 chat_bp = Blueprint('chat', __name__)
 
@@ -53,12 +54,13 @@ def init_chat_routes(db):
             if claims.get('role') != 'admin':
                 return jsonify({'error': 'Admin access required'}), 403
             
-            skip = request.args.get('skip', 0, type=int)
-            limit = request.args.get('limit', 20, type=int)
+            skip, limit, cursor = page_args(20)
             
-            chats = chat_model.get_all_chats(skip, limit)
-            return jsonify(chats), 200
+            chats, next_cursor = chat_model.get_all_chats(skip, limit, cursor)
+            return page_response(chats, next_cursor), 200
             
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     
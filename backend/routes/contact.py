@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt
 from models.contact import Contact
+from services.pagination import InvalidCursor, page_args, page_response
 
 contact_bp = Blueprint('contact', __name__)
 
@@ -44,12 +45,13 @@ def init_contact_routes(db):
             if claims.get('role') != 'admin':
                 return jsonify({'error': 'Admin access required'}), 403
             
-            skip = request.args.get('skip', 0, type=int)
-            limit = request.args.get('limit', 20, type=int)
+            skip, limit, cursor = page_args(20)
             
-            contacts = contact_model.get_all_contacts(skip, limit)
-            return jsonify(contacts), 200
+            contacts, next_cursor = contact_model.get_all_contacts(skip, limit, cursor)
+            return page_response(contacts, next_cursor), 200
             
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     
@@ -62,12 +64,13 @@ def init_contact_routes(db):
             if claims.get('role') != 'admin':
                 return jsonify({'error': 'Admin access required'}), 403
             
-            skip = request.args.get('skip', 0, type=int)
-            limit = request.args.get('limit', 20, type=int)
+            skip, limit, cursor = page_args(20)
             
-            contacts = contact_model.get_pending_contacts(skip, limit)
-            return jsonify(contacts), 200
+            contacts, next_cursor = contact_model.get_pending_contacts(skip, limit, cursor)
+            return page_response(contacts, next_cursor), 200
             
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     
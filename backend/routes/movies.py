@@ -1,7 +1,19 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from models.movie import Movie
+from models.rating import Rating
+from models.review import Review
 from services.omdb_service import OMDbService
+from services.search_service import SearchService
+from services.single_flight import SingleFlight
+from services.pagination import InvalidCursor, clamp_limit, page_args, page_response
+from services.http_caching import http_cache, version_etag
+from services.title_index import title_index
+from services.movie_fields import derive_catalog_fields
+from services.index_advisor import IndexAdvisor
+from services.trending_service import TrendingService
+from services.collaborative_filter import CollaborativeFilter
+from services.response_cache import response_cache
 from config import Config
 
 movies_bp = Blueprint('movies', __name__)
@@ -9,26 +21,68 @@ movies_bp = Blueprint('movies', __name__)
 def init_movies_routes(db):
     """Initialize movies routes with database"""
     movie_model = Movie(db)
-    omdb_service = OMDbService()
+    title_index.start()
+    rating_model = Rating(db)
+    review_model = Review(db)
+    omdb_service = OMDbService(db)
+    search_service = SearchService(movie_model, omdb_service)
+    fetch_flight = SingleFlight(db, 'movie-fetch', Config.FETCH_LEASE_SECONDS)
+    index_advisor = IndexAdvisor(db)
+    trending_service = TrendingService(db)
+    trending_service.start_scheduler()
+    collaborative_filter = CollaborativeFilter(db)
     
     @movies_bp.route('/search', methods=['GET'])
     def search_movies():
-        """Search movies from OMDb API"""
+        """Search the local catalog first and OMDb only for what it lacks"""
         try:
-            query = request.args.get('q', '')
+            query = request.args.get('q', '').strip()
             year = request.args.get('year')
-            page = request.args.get('page', 1, type=int)
+            page = max(request.args.get('page', 1, type=int), 1)
             
             if not query:
                 return jsonify({'error': 'Search query is required'}), 400
             
-            results = omdb_service.search_movies(query, year, page)
+            results = search_service.search(query, year, page)
             
             return jsonify(results), 200
             
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     
+    @movies_bp.route('/local-search', methods=['GET'])
+    @http_cache('movies.search')
+    def local_search_movies():
+        """Search movies stored in the local catalog"""
+        try:
+            query = request.args.get('q', '').strip()
+            skip = request.args.get('skip', 0, type=int)
+            limit = clamp_limit(request.args.get('limit', Config.ITEMS_PER_PAGE, type=int))
+            
+            if not query:
+                return jsonify({'error': 'Search query is required'}), 400
+            
+            projection = movie_model.projection_for(request.args.get('view'))
+            movies = movie_model.search_movies(query, skip, limit, projection)
+            
+            return jsonify(movies), 200
+            
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
+    @movies_bp.route('/suggest', methods=['GET'])
+    @http_cache('movies.suggest')
+    def suggest_movies():
+        """Suggest local movies whose title starts with the typed text"""
+        try:
+            query = request.args.get('q', '')
+            limit = max(1, min(request.args.get('limit', 8, type=int), Config.SUGGEST_MAX_RESULTS))
+            
+            return jsonify(title_index.suggest(query, limit)), 200
+            
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
     @movies_bp.route('/fetch/<imdb_id>', methods=['GET'])
     def fetch_movie_by_imdb(imdb_id):
         """Fetch movie details from OMDb API by IMDb ID"""
@@ -39,16 +93,27 @@ def init_movies_routes(db):
             if existing_movie:
                 return jsonify(existing_movie), 200
             
-            # Fetch from OMDb API
-            movie_data = omdb_service.fetch_movie_by_imdb_id(imdb_id)
+            def load_movie():
+                # Fetch from OMDb API
+                movie_data = omdb_service.fetch_movie_by_imdb_id(imdb_id)
+                
+                if not movie_data:
+                    return None
+                
+                # Save to database
+                movie_data['_id'] = movie_model.create_movie(movie_data)
+                return movie_data
+            
+            # Concurrent misses for the same title share one fetch and insert
+            movie_data = fetch_flight.do(
+                imdb_id,
+                load_movie,
+                check=lambda: movie_model.get_movie_by_imdb_id(imdb_id)
+            )
             
             if not movie_data:
                 return jsonify({'error': 'Movie not found'}), 404
             
-            # Save to database
-            movie_id = movie_model.create_movie(movie_data)
-            movie_data['_id'] = movie_id
-            
             return jsonify(movie_data), 200
             
         except Exception as e:
@@ -84,7 +149,86 @@ def init_movies_routes(db):
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     
+    @movies_bp.route('/ingest', methods=['POST'])
+    @jwt_required()
+    def ingest_movies():
+        """Bulk load movies by IMDb ID or as pre-formatted documents (admin only)"""
+        try:
+            claims = get_jwt()
+            if claims.get('role') != 'admin':
+                return jsonify({'error': 'Admin access required'}), 403
+            
+            data = request.get_json() or {}
+            imdb_ids = data.get('imdb_ids', [])
+            documents = data.get('movies', [])
+            refresh = data.get('refresh', False)
+            
+            if not isinstance(imdb_ids, list) or not isinstance(documents, list):
+                return jsonify({'error': 'imdb_ids and movies must be lists'}), 400
+            
+            if not imdb_ids and not documents:
+                return jsonify({'error': 'imdb_ids or movies is required'}), 400
+            
+            if len(imdb_ids) + len(documents) > Config.INGEST_MAX_ITEMS:
+                return jsonify({'error': f'At most {Config.INGEST_MAX_ITEMS} items per request'}), 400
+            
+            results = []
+            to_write = {}
+            
+            # Pre-formatted documents are written as given, minus server-managed fields,
+            # plus the derived catalog fields
+            for doc in documents:
+                if not isinstance(doc, dict) or not isinstance(doc.get('imdb_id'), str):
+                    results.append({'imdb_id': None, 'status': 'invalid', 'error': 'imdb_id is required'})
+                    continue
+                for field in ('_id', 'created_at', 'updated_at', 'view_count', 'reviews', 'review_count',
+                              'rating_count', 'rating_sum', 'rating_avg', 'rating_histogram'):
+                    doc.pop(field, None)
+                doc.update(derive_catalog_fields(doc))
+                to_write[doc['imdb_id']] = doc
+            
+            # IMDb IDs are fetched from OMDb unless already stored
+            pending = []
+            for imdb_id in dict.fromkeys(imdb_ids):
+                if not isinstance(imdb_id, str) or not imdb_id:
+                    results.append({'imdb_id': imdb_id, 'status': 'invalid', 'error': 'IMDb ID must be a string'})
+                elif imdb_id not in to_write:
+                    pending.append(imdb_id)
+            
+            if pending and not refresh:
+                existing = movie_model.get_existing_imdb_ids(pending)
+                results.extend({'imdb_id': imdb_id, 'status': 'exists'} for imdb_id in pending if imdb_id in existing)
+                pending = [imdb_id for imdb_id in pending if imdb_id not in existing]
+            
+            for imdb_id, movie_data in zip(pending, omdb_service.fetch_movies_by_imdb_ids(pending)):
+                if movie_data:
+                    to_write[imdb_id] = movie_data
+                else:
+                    results.append({'imdb_id': imdb_id, 'status': 'not_found'})
+            
+            results.extend(movie_model.bulk_upsert_movies(list(to_write.values())))
+            
+            summary = {}
+            for result in results:
+                summary[result['status']] = summary.get(result['status'], 0) + 1
+            
+            return jsonify({'results': results, 'summary': summary}), 200
+            
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
+    def movie_validator(movie_id):
+        """Count a view and get the movie's ETag; runs for 304s as well"""
+        version = movie_model.get_movie_version(movie_id)
+        if not version:
+            return None
+        
+        movie_model.increment_view_count(movie_id)
+        trending_service.record_view(movie_id)
+        return version_etag(version)
+    
     @movies_bp.route('/<movie_id>', methods=['GET'])
+    @http_cache('movies.detail', etag=movie_validator)
     def get_movie(movie_id):
         """Get movie by ID from database"""
         try:
@@ -93,51 +237,76 @@ def init_movies_routes(db):
             if not movie:
                 return jsonify({'error': 'Movie not found'}), 404
             
-            # Increment view count
-            movie_model.increment_view_count(movie_id)
-            
             return jsonify(movie), 200
             
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     
     @movies_bp.route('/production-house/<production_house>', methods=['GET'])
+    @http_cache('movies.list')
     def get_movies_by_production_house(production_house):
         """Get movies by production house"""
         try:
-            skip = request.args.get('skip', 0, type=int)
-            limit = request.args.get('limit', Config.ITEMS_PER_PAGE, type=int)
+            skip, limit, cursor = page_args()
             sort_by = request.args.get('sort_by', 'year')
+            projection = movie_model.projection_for(request.args.get('view'))
             
-            movies = movie_model.get_movies_by_production_house(
-                production_house, skip, limit, sort_by
+            movies, next_cursor = movie_model.get_movies_by_production_house(
+                production_house, skip, limit, sort_by, cursor, projection
             )
             
-            return jsonify(movies), 200
+            return page_response(movies, next_cursor), 200
             
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     
     @movies_bp.route('/genre/<genre>', methods=['GET'])
+    @http_cache('movies.list')
+    @response_cache.cached('movies.genre', tags=('movies',))
     def get_movies_by_genre(genre):
         """Get movies by genre"""
         try:
-            skip = request.args.get('skip', 0, type=int)
-            limit = request.args.get('limit', Config.ITEMS_PER_PAGE, type=int)
+            skip, limit, cursor = page_args()
+            sort_by = request.args.get('sort_by', 'year')
+            projection = movie_model.projection_for(request.args.get('view'))
             
-            movies = movie_model.get_movies_by_genre(genre, skip, limit)
+            movies, next_cursor = movie_model.get_movies_by_genre(
+                genre, skip, limit, sort_by, cursor, projection
+            )
             
-            return jsonify(movies), 200
+            return page_response(movies, next_cursor), 200
             
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     
     @movies_bp.route('/trending', methods=['GET'])
+    @http_cache('movies.list')
+    @response_cache.cached('movies.trending', tags=('movies', 'trending'))
     def get_trending_movies():
         """Get trending movies"""
         try:
-            limit = request.args.get('limit', 10, type=int)
-            movies = movie_model.get_trending_movies(limit)
+            limit = clamp_limit(request.args.get('limit', 10, type=int))
+            view = request.args.get('view')
+            scope = trending_service.scope_for(
+                request.args.get('genre'),
+                request.args.get('production_house')
+            )
+            
+            movies = trending_service.get_trending(scope, limit)
+            
+            if movies is None:
+                # Nothing materialized for this scope; fall back to its lifetime views
+                movies = movie_model.get_trending_movies(
+                    limit, movie_model.projection_for(view), trending_service.scope_query(scope)
+                )
+            elif view == 'full':
+                movies = movie_model.get_movies_by_ids(
+                    [movie['_id'] for movie in movies], movie_model.projection_for(view)
+                )
             
             return jsonify(movies), 200
             
@@ -145,11 +314,14 @@ def init_movies_routes(db):
             return jsonify({'error': str(e)}), 500
     
     @movies_bp.route('/top-rated', methods=['GET'])
+    @http_cache('movies.list')
+    @response_cache.cached('movies.top_rated', tags=('movies',))
     def get_top_rated_movies():
         """Get top rated movies"""
         try:
-            limit = request.args.get('limit', 10, type=int)
-            movies = movie_model.get_top_rated_movies(limit)
+            limit = clamp_limit(request.args.get('limit', 10, type=int))
+            projection = movie_model.projection_for(request.args.get('view'))
+            movies = movie_model.get_top_rated_movies(limit, projection)
             
             return jsonify(movies), 200
             
@@ -160,14 +332,35 @@ def init_movies_routes(db):
     def filter_movies():
         """Filter movies by multiple criteria"""
         try:
-            filters = request.get_json()
-            skip = request.args.get('skip', 0, type=int)
-            limit = request.args.get('limit', Config.ITEMS_PER_PAGE, type=int)
+            filters = request.get_json() or {}
+            skip, limit, cursor = page_args()
             
-            movies = movie_model.filter_movies(filters, skip, limit)
+            # Sample the query shape for the admin index advisor
+            query, sort_field, sort_order = movie_model.build_filter(filters)
+            index_advisor.record('movies', query, [(sort_field, sort_order), ('_id', sort_order)])
             
-            return jsonify(movies), 200
+            projection = movie_model.projection_for(request.args.get('view'))
+            movies, next_cursor = movie_model.filter_movies(filters, skip, limit, cursor, projection)
+            
+            return page_response(movies, next_cursor), 200
             
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
+    @movies_bp.route('/facets', methods=['POST'])
+    @response_cache.cached('movies.facets', tags=('movies',))
+    def get_movie_facets():
+        """Count movies per genre, decade, production house and rating band for a filter"""
+        try:
+            filters = request.get_json(silent=True) or {}
+            facets = movie_model.get_facets(filters)
+            
+            return jsonify(facets), 200
+            
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': f'Invalid filter: {str(e)}'}), 400
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     
@@ -180,12 +373,46 @@ def init_movies_routes(db):
             data = request.get_json()
             rating = data.get('rating')
             
-            if not rating or not (0 <= float(rating) <= 10):
+            if rating is None or not (0 <= float(rating) <= 10):
                 return jsonify({'error': 'Rating must be between 0 and 10'}), 400
             
-            movie_model.add_rating(movie_id, user_id, float(rating))
+            aggregates = rating_model.rate(movie_id, user_id, float(rating))
+            
+            if aggregates is None:
+                return jsonify({'error': 'Movie not found'}), 404
+            
+            return jsonify({'message': 'Rating added successfully', **aggregates}), 200
+            
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
+    @movies_bp.route('/<movie_id>/my-rating', methods=['GET'])
+    @jwt_required()
+    def get_my_rating(movie_id):
+        """Get the current user's rating for a movie"""
+        try:
+            user_id = get_jwt_identity()
+            rating = rating_model.get_user_rating(movie_id, user_id)
+            
+            return jsonify({'movie_id': movie_id, 'rating': rating}), 200
+            
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
+    @movies_bp.route('/my-ratings', methods=['GET'])
+    @jwt_required()
+    def get_my_ratings():
+        """Get the current user's ratings for a comma-separated list of movie IDs"""
+        try:
+            user_id = get_jwt_identity()
+            movie_ids = [movie_id for movie_id in request.args.get('ids', '').split(',') if movie_id]
+            
+            if len(movie_ids) > Config.MAX_PAGE_SIZE:
+                return jsonify({'error': f'At most {Config.MAX_PAGE_SIZE} movie IDs per request'}), 400
             
-            return jsonify({'message': 'Rating added successfully'}), 200
+            ratings = rating_model.get_user_ratings(user_id, movie_ids)
+            
+            return jsonify({'ratings': ratings}), 200
             
         except Exception as e:
             return jsonify({'error': str(e)}), 500
@@ -202,14 +429,70 @@ def init_movies_routes(db):
             if not review:
                 return jsonify({'error': 'Review text is required'}), 400
             
-            movie_model.add_review(movie_id, user_id, review)
+            created = review_model.create_review(movie_id, user_id, review)
+            
+            if created is None:
+                return jsonify({'error': 'Movie not found'}), 404
+            
+            return jsonify({'message': 'Review added successfully', 'review': created}), 200
+            
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
+    @movies_bp.route('/<movie_id>/reviews', methods=['GET'])
+    @http_cache('movies.reviews')
+    def get_movie_reviews(movie_id):
+        """Get a page of reviews for a movie, newest first"""
+        try:
+            skip, limit, cursor = page_args()
+            reviews, next_cursor = review_model.get_movie_reviews(movie_id, skip, limit, cursor)
+            
+            return page_response(reviews, next_cursor), 200
+            
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
+    @movies_bp.route('/<movie_id>/also-liked', methods=['GET'])
+    @http_cache('movies.list')
+    def get_also_liked(movie_id):
+        """Get movies liked by the same users, most similar first"""
+        try:
+            limit = clamp_limit(request.args.get('limit', 10, type=int))
+            
+            if movie_model.get_movie_version(movie_id) is None:
+                return jsonify({'error': 'Movie not found'}), 404
+            
+            neighbors = collaborative_filter.get_neighbors(movie_id, limit)
+            movies = movie_model.get_movies_by_ids(
+                [neighbor_id for neighbor_id, _ in neighbors], movie_model.CARD_PROJECTION
+            )
+            
+            return jsonify({'movies': movies}), 200
+            
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
+    @movies_bp.route('/<movie_id>/similar', methods=['GET'])
+    @http_cache('movies.list')
+    def get_similar_movies(movie_id):
+        """Get movies with similar plot, genres, cast, director and studio"""
+        try:
+            limit = clamp_limit(request.args.get('limit', 10, type=int))
+            
+            movies = movie_model.get_similar_movies(movie_id, limit)
+            if movies is None:
+                return jsonify({'error': 'Movie not found'}), 404
             
-            return jsonify({'message': 'Review added successfully'}), 200
+            return jsonify({'movies': movies}), 200
             
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     
     @movies_bp.route('/production-houses', methods=['GET'])
+    @http_cache('movies.production_houses')
+    @response_cache.cached('movies.production_houses')
     def get_production_houses():
         """Get list of all production houses"""
         return jsonify({'production_houses': Config.PRODUCTION_HOUSES}), 200
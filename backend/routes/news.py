@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from models.news import News
+from services.pagination import InvalidCursor, clamp_limit, page_args, page_response
+from services.http_caching import http_cache, version_etag
+from services.response_cache import response_cache
 
 news_bp = Blueprint('news', __name__)
 
@@ -9,19 +12,32 @@ def init_news_routes(db):
     news_model = News(db)
     
     @news_bp.route('/', methods=['GET'])
+    @http_cache('news.list')
+    @response_cache.cached('news.all', tags=('news',))
     def get_all_news():
         """Get all news articles"""
         try:
-            skip = request.args.get('skip', 0, type=int)
-            limit = request.args.get('limit', 20, type=int)
+            skip, limit, cursor = page_args(20)
             
-            news_list = news_model.get_all_news(skip, limit)
-            return jsonify(news_list), 200
+            news_list, next_cursor = news_model.get_all_news(skip, limit, cursor)
+            return page_response(news_list, next_cursor), 200
             
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     
+    def news_validator(news_id):
+        """Count a view and get the article's ETag; runs for 304s as well"""
+        version = news_model.get_news_version(news_id)
+        if not version:
+            return None
+        
+        news_model.increment_views(news_id)
+        return version_etag(version)
+    
     @news_bp.route('/<news_id>', methods=['GET'])
+    @http_cache('news.detail', etag=news_validator)
     def get_news(news_id):
         """Get news article by ID"""
         try:
@@ -30,32 +46,33 @@ def init_news_routes(db):
             if not news:
                 return jsonify({'error': 'News not found'}), 404
             
-            # Increment views
-            news_model.increment_views(news_id)
-            
             return jsonify(news), 200
             
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     
     @news_bp.route('/category/<category>', methods=['GET'])
+    @http_cache('news.list')
     def get_news_by_category(category):
         """Get news by category"""
         try:
-            skip = request.args.get('skip', 0, type=int)
-            limit = request.args.get('limit', 20, type=int)
+            skip, limit, cursor = page_args(20)
             
-            news_list = news_model.get_news_by_category(category, skip, limit)
-            return jsonify(news_list), 200
+            news_list, next_cursor = news_model.get_news_by_category(category, skip, limit, cursor)
+            return page_response(news_list, next_cursor), 200
             
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     
     @news_bp.route('/latest', methods=['GET'])
+    @http_cache('news.list')
+    @response_cache.cached('news.latest', tags=('news',))
     def get_latest_news():
         """Get latest news articles"""
         try:
-            limit = request.args.get('limit', 5, type=int)
+            limit = clamp_limit(request.args.get('limit', 5, type=int))
             news_list = news_model.get_latest_news(limit)
             return jsonify(news_list), 200
             
@@ -63,19 +80,21 @@ def init_news_routes(db):
             return jsonify({'error': str(e)}), 500
     
     @news_bp.route('/search', methods=['GET'])
+    @http_cache('news.list')
     def search_news():
         """Search news articles"""
         try:
             query = request.args.get('q', '')
-            skip = request.args.get('skip', 0, type=int)
-            limit = request.args.get('limit', 20, type=int)
+            skip, limit, cursor = page_args(20)
             
             if not query:
                 return jsonify({'error': 'Search query is required'}), 400
             
-            news_list = news_model.search_news(query, skip, limit)
-            return jsonify(news_list), 200
+            news_list, next_cursor = news_model.search_news(query, skip, limit, cursor)
+            return page_response(news_list, next_cursor), 200
             
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     
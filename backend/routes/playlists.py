@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models.playlist import Playlist
+from services.pagination import InvalidCursor, page_args, page_response
+from services.http_caching import http_cache
 
 playlists_bp = Blueprint('playlists', __name__)
 
@@ -57,15 +59,17 @@ def init_playlists_routes(db):
             return jsonify({'error': str(e)}), 500
     
     @playlists_bp.route('/public', methods=['GET'])
+    @http_cache('playlists.public')
     def get_public_playlists():
         """Get all public playlists"""
         try:
-            skip = request.args.get('skip', 0, type=int)
-            limit = request.args.get('limit', 20, type=int)
+            skip, limit, cursor = page_args(20)
             
-            playlists = playlist_model.get_public_playlists(skip, limit)
-            return jsonify(playlists), 200
+            playlists, next_cursor = playlist_model.get_public_playlists(skip, limit, cursor)
+            return page_response(playlists, next_cursor), 200
             
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     
@@ -2,6 +2,10 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models.user import User
 from models.playlist import Playlist
+from models.review import Review
+from models.movie import Movie
+from services.collaborative_filter import CollaborativeFilter
+from services.pagination import InvalidCursor, clamp_limit, page_args, page_response
 
 profile_bp = Blueprint('profile', __name__)
 
@@ -9,6 +13,9 @@ def init_profile_routes(db):
     """Initialize profile routes with database"""
     user_model = User(db)
     playlist_model = Playlist(db)
+    review_model = Review(db)
+    movie_model = Movie(db)
+    collaborative_filter = CollaborativeFilter(db)
     
     @profile_bp.route('/', methods=['GET'])
     @jwt_required()
@@ -193,4 +200,40 @@ def init_profile_routes(db):
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     
+    @profile_bp.route('/reviews', methods=['GET'])
+    @jwt_required()
+    def get_my_reviews():
+        """Get a page of the current user's reviews, newest first"""
+        try:
+            user_id = get_jwt_identity()
+            skip, limit, cursor = page_args()
+            
+            reviews, next_cursor = review_model.get_user_reviews(user_id, skip, limit, cursor)
+            return page_response(reviews, next_cursor), 200
+            
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
+    @profile_bp.route('/recommendations', methods=['GET'])
+    @jwt_required()
+    def get_recommendations():
+        """Get movies similar to the user's favorites, watchlist and history"""
+        try:
+            user_id = get_jwt_identity()
+            user = user_model.get_user_by_id(user_id)
+            
+            if not user:
+                return jsonify({'error': 'User not found'}), 404
+            
+            limit = clamp_limit(request.args.get('limit', 20, type=int))
+            movie_ids = collaborative_filter.recommend_for_user(user, limit)
+            movies = movie_model.get_movies_by_ids(movie_ids, movie_model.CARD_PROJECTION)
+            
+            return jsonify({'movies': movies}), 200
+            
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
     return profile_bp
@@ -0,0 +1,37 @@
+"""
+Catalog Backfill Script
+Recompute the normalized, indexed fields on movies already in the database
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo import MongoClient
+from config import Config
+from services.backfill import CATALOG_BACKFILL, backfill_catalog as run_backfill
+
+def backfill_catalog(batch_size=500, restart=False):
+    """
+    Backfill derived catalog fields in resumable batches
+    
+    Args:
+        batch_size: Number of movies read and written per batch
+        restart: Ignore the saved checkpoint and start from the first movie
+    """
+    print("=" * 60)
+    print("🎬 MOVIE PLATFORM - CATALOG BACKFILL")
+    print("=" * 60)
+    
+    client = MongoClient(Config.MONGO_URI)
+    db = client[Config.DATABASE_NAME]
+    
+    processed = run_backfill(db, batch_size, restart)
+    
+    print(f"✅ {CATALOG_BACKFILL}: processed {processed} movies")
+
+if __name__ == '__main__':
+    restart = '--restart' in sys.argv
+    backfill_catalog(restart=restart)
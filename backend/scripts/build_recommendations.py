@@ -0,0 +1,25 @@
+"""
+Recommendations Build Script
+Recompute item-to-item neighbors from favorites, watchlists and watch history
+(run from cron or a scheduled job)
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo import MongoClient
+from config import Config
+from services.collaborative_filter import CollaborativeFilter
+
+if __name__ == '__main__':
+    client = MongoClient(Config.MONGO_URI)
+    db = client[Config.DATABASE_NAME]
+    
+    result = CollaborativeFilter(db).build()
+    
+    print(f"✅ Recommendations built: {result['users']} users, "
+          f"{result['interactions']} interactions, "
+          f"{result['movies_with_neighbors']} movies with neighbors")
@@ -0,0 +1,23 @@
+"""
+Similar Movies Build Script
+Recompute content-based similar movies for the whole catalog
+(run after seeding or bulk ingests, and from cron)
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo import MongoClient
+from config import Config
+from services.content_similarity import ContentSimilarity
+
+if __name__ == '__main__':
+    client = MongoClient(Config.MONGO_URI)
+    db = client[Config.DATABASE_NAME]
+    
+    result = ContentSimilarity(db).build()
+    
+    print(f"✅ Similar movies built for {result['movies']} movies")
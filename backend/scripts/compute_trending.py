@@ -0,0 +1,23 @@
+"""
+Trending Computation Script
+Recompute time-decayed trending lists (run from cron or a scheduled job)
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo import MongoClient
+from config import Config
+from services.trending_service import TrendingService
+
+if __name__ == '__main__':
+    client = MongoClient(Config.MONGO_URI)
+    db = client[Config.DATABASE_NAME]
+    
+    result = TrendingService(db).compute()
+    
+    print(f"✅ Trending computed: {result['movies_scored']} movies scored, "
+          f"{result['scopes']} scopes written")
@@ -0,0 +1,84 @@
+"""
+Ratings Migration Script
+Move user ratings embedded in movie documents into the movie_ratings collection
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+from pymongo import MongoClient, UpdateOne
+from config import Config
+from models.rating import Rating
+from services.backfill import BackfillRunner
+
+def migrate_ratings(batch_size=200, restart=False):
+    """
+    Move embedded user ratings out of movies in resumable batches
+    
+    User ratings were pushed into the same `ratings` array that holds the
+    OMDb source ratings; they are the entries that carry a user_id. The
+    latest entry per user wins, and ratings already given through the new
+    endpoint are kept.
+    
+    Args:
+        batch_size: Number of movies read per batch
+        restart: Ignore the saved checkpoint and start from the first movie
+    """
+    print("=" * 60)
+    print("🎬 MOVIE PLATFORM - RATINGS MIGRATION")
+    print("=" * 60)
+    
+    client = MongoClient(Config.MONGO_URI)
+    db = client[Config.DATABASE_NAME]
+    rating_model = Rating(db)
+    
+    def process_batch(movies):
+        for movie in movies:
+            movie_id = str(movie['_id'])
+            latest = {}
+            for entry in movie.get('ratings', []):
+                if isinstance(entry, dict) and entry.get('user_id') is not None:
+                    latest[entry['user_id']] = entry
+            
+            now = datetime.utcnow()
+            operations = [
+                UpdateOne(
+                    {'movie_id': movie_id, 'user_id': user_id},
+                    {'$setOnInsert': {
+                        'rating': float(entry['rating']),
+                        'created_at': entry.get('created_at', now),
+                        'updated_at': entry.get('created_at', now)
+                    }},
+                    upsert=True
+                )
+                for user_id, entry in latest.items()
+            ]
+            if operations:
+                rating_model.collection.bulk_write(operations, ordered=False)
+            
+            # Leave only the OMDb source ratings behind
+            db.movies.update_one(
+                {'_id': movie['_id']},
+                {'$pull': {'ratings': {'user_id': {'$exists': True}}}}
+            )
+            rating_model.recompute_aggregates(movie_id)
+    
+    processed = BackfillRunner(db).run(
+        'movie_ratings_collection',
+        db.movies,
+        process_batch,
+        query={'ratings.user_id': {'$exists': True}},
+        projection={'ratings': 1},
+        batch_size=batch_size,
+        restart=restart
+    )
+    
+    print(f"✅ Moved ratings out of {processed} movies")
+
+if __name__ == '__main__':
+    restart = '--restart' in sys.argv
+    migrate_ratings(restart=restart)
@@ -0,0 +1,79 @@
+"""
+Reviews Migration Script
+Move reviews embedded in movie documents into the reviews collection
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+from pymongo import MongoClient, UpdateOne
+from config import Config
+from models.review import Review
+from services.backfill import BackfillRunner
+
+def migrate_reviews(batch_size=200, restart=False):
+    """
+    Move embedded reviews out of movies in resumable batches
+    
+    Reviews are upserted on (movie, user, created_at), so a batch that is
+    replayed after an interruption does not duplicate them.
+    
+    Args:
+        batch_size: Number of movies read per batch
+        restart: Ignore the saved checkpoint and start from the first movie
+    """
+    print("=" * 60)
+    print("🎬 MOVIE PLATFORM - REVIEWS MIGRATION")
+    print("=" * 60)
+    
+    client = MongoClient(Config.MONGO_URI)
+    db = client[Config.DATABASE_NAME]
+    review_model = Review(db)
+    
+    def process_batch(movies):
+        for movie in movies:
+            movie_id = str(movie['_id'])
+            
+            operations = []
+            for entry in movie.get('reviews') or []:
+                if not isinstance(entry, dict) or not entry.get('review'):
+                    continue
+                key = {
+                    'movie_id': movie_id,
+                    'user_id': entry.get('user_id'),
+                    'created_at': entry.get('created_at') or movie.get('created_at') or datetime.utcnow()
+                }
+                operations.append(UpdateOne(
+                    key,
+                    {'$setOnInsert': {'review': entry['review']}},
+                    upsert=True
+                ))
+            
+            if operations:
+                review_model.collection.bulk_write(operations, ordered=False)
+            
+            review_count = review_model.collection.count_documents({'movie_id': movie_id})
+            db.movies.update_one(
+                {'_id': movie['_id']},
+                {'$unset': {'reviews': ''}, '$set': {'review_count': review_count}}
+            )
+    
+    processed = BackfillRunner(db).run(
+        'reviews_collection',
+        db.movies,
+        process_batch,
+        query={'reviews': {'$exists': True}},
+        projection={'reviews': 1, 'created_at': 1},
+        batch_size=batch_size,
+        restart=restart
+    )
+    
+    print(f"✅ Moved reviews out of {processed} movies")
+
+if __name__ == '__main__':
+    restart = '--restart' in sys.argv
+    migrate_reviews(restart=restart)
@@ -0,0 +1,107 @@
+from datetime import datetime
+from pymongo import UpdateOne
+from config import Config
+from services.movie_fields import (
+    CATALOG_FIELDS_VERSION, CATALOG_SOURCE_FIELDS, derive_catalog_fields
+)
+from services.response_cache import response_cache
+
+CATALOG_BACKFILL = f"catalog_fields_v{CATALOG_FIELDS_VERSION}"
+
+class BackfillRunner:
+    """Resumable, batched backfill over a collection in _id order"""
+    
+    def __init__(self, db):
+        self.checkpoints = db.migrations
+    
+    def run(self, name, collection, process_batch, query=None, projection=None,
+            batch_size=500, restart=False):
+        """Feed documents to process_batch, checkpointing after every batch"""
+        checkpoint = None if restart else self.checkpoints.find_one({'_id': name})
+        last_id = checkpoint.get('last_id') if checkpoint else None
+        processed = 0
+        
+        started = {'started_at': datetime.utcnow()}
+        if restart:
+            started.update({'processed': 0, 'last_id': None})
+        self.checkpoints.update_one(
+            {'_id': name},
+            {'$set': started, '$unset': {'completed_at': ''}},
+            upsert=True
+        )
+        
+        while True:
+            batch_query = dict(query or {})
+            if last_id is not None:
+                batch_query['_id'] = {'$gt': last_id}
+            
+            docs = list(collection.find(batch_query, projection).sort('_id', 1).limit(batch_size))
+            if not docs:
+                break
+            
+            process_batch(docs)
+            last_id = docs[-1]['_id']
+            processed += len(docs)
+            
+            self.checkpoints.update_one(
+                {'_id': name},
+                {
+                    '$set': {'last_id': last_id, 'updated_at': datetime.utcnow()},
+                    '$inc': {'processed': len(docs)}
+                },
+                upsert=True
+            )
+        
+        self.checkpoints.update_one(
+            {'_id': name},
+            {'$set': {'completed_at': datetime.utcnow()}},
+            upsert=True
+        )
+        
+        return processed
+    
+    def set_fields(self, name, collection, derive, **kwargs):
+        """Backfill by setting the fields derive(doc) returns on each document
+        
+        Changed documents get a new updated_at, so ETags built from it and
+        index syncs that follow it see the change.
+        """
+        def process_batch(docs):
+            now = datetime.utcnow()
+            operations = []
+            for doc in docs:
+                fields = derive(doc)
+                if fields:
+                    operations.append(UpdateOne(
+                        {'_id': doc['_id']},
+                        {'$set': {**fields, 'updated_at': now}}
+                    ))
+            
+            if operations:
+                collection.bulk_write(operations, ordered=False)
+        
+        return self.run(name, collection, process_batch, **kwargs)
+    
+    def get_status(self, name):
+        """Get the checkpoint for a backfill, if it has run"""
+        checkpoint = self.checkpoints.find_one({'_id': name})
+        if checkpoint:
+            checkpoint['last_id'] = str(checkpoint.get('last_id'))
+        return checkpoint
+
+def clamp_batch_size(batch_size):
+    """Coerce a requested batch size to an int within 1..BACKFILL_MAX_BATCH_SIZE"""
+    return max(1, min(int(batch_size), Config.BACKFILL_MAX_BATCH_SIZE))
+
+def backfill_catalog(db, batch_size=500, restart=False):
+    """Recompute derived catalog fields on every movie, returning the number processed"""
+    processed = BackfillRunner(db).set_fields(
+        CATALOG_BACKFILL,
+        db.movies,
+        derive_catalog_fields,
+        projection=CATALOG_SOURCE_FIELDS,
+        batch_size=clamp_batch_size(batch_size),
+        restart=restart
+    )
+    response_cache.invalidate('movies')
+    return processed
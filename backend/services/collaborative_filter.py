@@ -0,0 +1,184 @@
+from datetime import datetime
+from pymongo import ReplaceOne
+from config import Config
+
+class CollaborativeFilter:
+    """Item-to-item collaborative filtering over favorites, watchlists and history
+    
+    build() is an offline batch job: it streams users in batches, adds each
+    batch's item co-occurrences (X_b^T X_b) into one sparse item x item
+    matrix, turns that into cosine similarities and stores the top-k
+    neighbors of every movie in the movie_neighbors collection. Memory is
+    bounded by the co-occurrence matrices, not by the number of users.
+    
+    A pair liked by a handful of users can reach a cosine of 1, so pairs
+    shared by fewer than RECOMMEND_MIN_SUPPORT users are dropped and the
+    rest shrunk by their support n as n / (n + RECOMMEND_SHRINKAGE).
+    
+    Serving only reads stored neighbors, so numpy and scipy are imported by
+    the build alone.
+    """
+    
+    # How strongly each kind of interaction signals that a user liked a movie
+    WEIGHTS = {'favorites': 3.0, 'watch_history': 1.0, 'watchlist': 0.5}
+    
+    def __init__(self, db):
+        self.users = db.users
+        self.movies = db.movies
+        self.collection = db.movie_neighbors
+    
+    def _interactions(self, user):
+        """Map a user's movies to their strongest interaction weight"""
+        weights = {}
+        for field, weight in self.WEIGHTS.items():
+            for item in user.get(field) or []:
+                movie_id = item.get('movie_id') if isinstance(item, dict) else item
+                if movie_id:
+                    weights[movie_id] = max(weights.get(movie_id, 0.0), weight)
+        return weights
+    
+    @staticmethod
+    def _batch_grams(rows, cols, values, batch_users, n_movies):
+        """Weighted item co-occurrences of one batch of users, and how many users each pair has"""
+        import numpy as np
+        from scipy import sparse
+        
+        matrix = sparse.csr_matrix(
+            (np.asarray(values, dtype=np.float32), (rows, cols)),
+            shape=(batch_users, n_movies)
+        )
+        seen = matrix.copy()
+        seen.data[:] = 1.0
+        return (matrix.T @ matrix).tocsr(), (seen.T @ seen).tocsr()
+    
+    def build(self, top_k=None, batch_size=None):
+        """Recompute and store the top-k neighbors of every movie"""
+        import numpy as np
+        from scipy import sparse
+        
+        top_k = top_k or Config.RECOMMEND_TOP_K
+        batch_size = batch_size or Config.RECOMMEND_BATCH_SIZE
+        started_at = datetime.utcnow()
+        
+        movie_ids = [str(doc['_id']) for doc in self.movies.find({}, {'_id': 1})]
+        columns = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+        n_movies = len(movie_ids)
+        
+        gram = sparse.csr_matrix((n_movies, n_movies), dtype=np.float32)
+        support = sparse.csr_matrix((n_movies, n_movies), dtype=np.float32)
+        rows, cols, values = [], [], []
+        batch_users = 0
+        users = 0
+        interactions = 0
+        
+        projection = {'favorites': 1, 'watchlist': 1, 'watch_history.movie_id': 1}
+        for user in self.users.find({}, projection).batch_size(batch_size):
+            for movie_id, weight in self._interactions(user).items():
+                column = columns.get(movie_id)
+                if column is not None:
+                    rows.append(batch_users)
+                    cols.append(column)
+                    values.append(weight)
+            batch_users += 1
+            
+            if batch_users == batch_size:
+                batch_gram, batch_support = self._batch_grams(rows, cols, values, batch_users, n_movies)
+                gram = gram + batch_gram
+                support = support + batch_support
+                users += batch_users
+                interactions += len(values)
+                rows, cols, values = [], [], []
+                batch_users = 0
+        
+        if batch_users:
+            batch_gram, batch_support = self._batch_grams(rows, cols, values, batch_users, n_movies)
+            gram = gram + batch_gram
+            support = support + batch_support
+            users += batch_users
+            interactions += len(values)
+        
+        # cosine(i, j) = G[i, j] / (|i| |j|), where |i|^2 = G[i, i]
+        norms = np.sqrt(gram.diagonal())
+        inverse = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+        scale = sparse.diags(inverse)
+        similarity = (scale @ gram @ scale).tocsr()
+        
+        # Both matrices share one sparsity pattern, so shrinking is elementwise
+        shrinkage = support.copy()
+        shrinkage.data = np.where(
+            support.data >= Config.RECOMMEND_MIN_SUPPORT,
+            support.data / (support.data + Config.RECOMMEND_SHRINKAGE),
+            0.0
+        ).astype(np.float32)
+        similarity = similarity.multiply(shrinkage).tocsr()
+        similarity = (similarity - sparse.diags(similarity.diagonal())).tocsr()
+        similarity.eliminate_zeros()
+        
+        operations = []
+        stored = 0
+        for i in range(n_movies):
+            start, end = similarity.indptr[i], similarity.indptr[i + 1]
+            if start == end:
+                continue
+            
+            scores = similarity.data[start:end]
+            neighbors = similarity.indices[start:end]
+            if len(scores) > top_k:
+                best = np.argpartition(-scores, top_k)[:top_k]
+            else:
+                best = np.arange(len(scores))
+            best = best[np.argsort(-scores[best])]
+            
+            operations.append(ReplaceOne(
+                {'_id': movie_ids[i]},
+                {
+                    'neighbors': [
+                        {'movie_id': movie_ids[neighbors[j]], 'score': round(float(scores[j]), 4)}
+                        for j in best
+                    ],
+                    'computed_at': started_at
+                },
+                upsert=True
+            ))
+            
+            if len(operations) >= 1000:
+                self.collection.bulk_write(operations, ordered=False)
+                stored += len(operations)
+                operations = []
+        
+        if operations:
+            self.collection.bulk_write(operations, ordered=False)
+            stored += len(operations)
+        
+        # Movies that lost all co-occurrences keep no stale neighbors
+        self.collection.delete_many({'computed_at': {'$lt': started_at}})
+        
+        return {
+            'users': users,
+            'interactions': interactions,
+            'movies_with_neighbors': stored,
+            'computed_at': started_at
+        }
+    
+    def get_neighbors(self, movie_id, limit=10):
+        """Get a movie's neighbors as [(movie_id, score)], most similar first"""
+        doc = self.collection.find_one({'_id': movie_id}, {'neighbors': {'$slice': limit}})
+        if not doc:
+            return []
+        return [(n['movie_id'], n['score']) for n in doc['neighbors']]
+    
+    def recommend_for_user(self, user, limit=20):
+        """Rank movies similar to what a user liked, excluding ones they already have"""
+        interactions = self._interactions(user)
+        
+        # The strongest signals make the best seeds
+        seeds = sorted(interactions, key=interactions.get, reverse=True)[:Config.RECOMMEND_MAX_SEEDS]
+        
+        scores = {}
+        for doc in self.collection.find({'_id': {'$in': seeds}}):
+            weight = interactions[doc['_id']]
+            for neighbor in doc['neighbors']:
+                if neighbor['movie_id'] not in interactions:
+                    scores[neighbor['movie_id']] = scores.get(neighbor['movie_id'], 0.0) + weight * neighbor['score']
+        
+        return sorted(scores, key=scores.get, reverse=True)[:limit]
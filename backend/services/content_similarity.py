@@ -0,0 +1,275 @@
+import math
+import queue
+import re
+import threading
+import zlib
+from datetime import datetime
+from bson import ObjectId
+from pymongo import UpdateOne
+from config import Config
+from services.movie_fields import split_list_field
+
+class ContentSimilarity:
+    """Content-based "more like this" from plot, genres, people and studio
+    
+    Movies become TF-IDF vectors over hashed tokens (the hashing trick keeps
+    the vocabulary at a fixed CONTENT_HASH_DIM columns without storing it).
+    build() scores the whole catalog in blocks of rows against all movies
+    and stores each movie's top-k on the movie itself as `similar`, cards
+    included, so serving it is a single read by _id.
+    
+    The IDF weights of the last build are kept in the content_model
+    collection; add_movie() uses them to place a new movie among the most
+    viewed movies that share a genre or production house with it.
+    place_later() queues that work for a background thread so catalog writes
+    never wait for it.
+    
+    Every worker imports this module through the Movie model, so numpy and
+    scipy are only imported by the code that scores movies.
+    """
+    
+    # Tokens from short, specific fields say more than plot words
+    FIELD_WEIGHTS = {'plot': 1.0, 'genre': 2.0, 'director': 2.0, 'actors': 1.5, 'house': 1.5}
+    
+    # Card fields copied into each stored neighbor
+    CARD_FIELDS = ['imdb_id', 'title', 'year', 'poster']
+    
+    STOP_WORDS = frozenset(
+        'a an and are as at be but by for from has have he her his in into is it its '
+        'of on or she that the their them they this to was were when which while who '
+        'with after before about over only then there these through until'.split()
+    )
+    
+    _WORD_PATTERN = re.compile(r'[a-z0-9]+')
+    
+    def __init__(self, db):
+        self.movies = db.movies
+        self.model = db.content_model
+        self._idf = None
+        self._idf_computed_at = None
+        self._queue = queue.Queue(maxsize=Config.CONTENT_QUEUE_SIZE)
+        self._worker = None
+        self._worker_lock = threading.Lock()
+    
+    def _projection(self):
+        """Fields read to vectorize a movie and card its neighbors"""
+        fields = self.CARD_FIELDS + ['plot', 'genre', 'director', 'actors',
+                                     'production_house', 'production_houses']
+        return {field: 1 for field in fields}
+    
+    def tokens(self, movie):
+        """Field-prefixed tokens of a movie with their field weights"""
+        plot = movie.get('plot') if movie.get('plot') != 'N/A' else ''
+        words = self._WORD_PATTERN.findall((plot or '').lower())
+        
+        tokens = [(f"w:{word}", self.FIELD_WEIGHTS['plot'])
+                  for word in words if len(word) > 2 and word not in self.STOP_WORDS]
+        for field in ('genre', 'director', 'actors'):
+            tokens.extend((f"{field[0]}:{value}", self.FIELD_WEIGHTS[field])
+                          for value in split_list_field(movie.get(field)))
+        
+        houses = movie.get('production_houses') or split_list_field(movie.get('production_house'))
+        tokens.extend((f"h:{house.lower()}", self.FIELD_WEIGHTS['house']) for house in houses)
+        return tokens
+    
+    @staticmethod
+    def _column(token):
+        """Hash a token to its column (crc32 is stable across processes)"""
+        return zlib.crc32(token.encode('utf-8')) % Config.CONTENT_HASH_DIM
+    
+    def _term_weights(self, movie):
+        """Sublinear, field-weighted term frequencies as {column: weight}"""
+        counts = {}
+        for token, weight in self.tokens(movie):
+            column = self._column(token)
+            count, field_weight = counts.get(column, (0, 0.0))
+            counts[column] = (count + 1, max(field_weight, weight))
+        return {column: (1 + math.log(count)) * weight
+                for column, (count, weight) in counts.items()}
+    
+    def _matrix(self, movies, idf):
+        """L2-normalized TF-IDF rows for movies"""
+        import numpy as np
+        from scipy import sparse
+        
+        rows, cols, values = [], [], []
+        for row, movie in enumerate(movies):
+            for column, weight in self._term_weights(movie).items():
+                rows.append(row)
+                cols.append(column)
+                values.append(weight)
+        
+        matrix = sparse.csr_matrix(
+            (np.asarray(values, dtype=np.float32), (rows, cols)),
+            shape=(len(movies), Config.CONTENT_HASH_DIM)
+        )
+        matrix = (matrix @ sparse.diags(idf)).tocsr()
+        
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        inverse = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+        return (sparse.diags(inverse) @ matrix).tocsr()
+    
+    def _card(self, movie, score):
+        """A stored neighbor: the movie's card plus its similarity"""
+        card = {field: movie.get(field) for field in self.CARD_FIELDS}
+        card['movie_id'] = str(movie['_id'])
+        card['score'] = round(float(score), 4)
+        return card
+    
+    @staticmethod
+    def _top(scores, k):
+        """Indexes of the k highest scores, best first"""
+        import numpy as np
+        
+        if len(scores) > k:
+            best = np.argpartition(-scores, k)[:k]
+        else:
+            best = np.arange(len(scores))
+        return best[np.argsort(-scores[best])]
+    
+    def build(self, top_k=None, block_size=None):
+        """Recompute and store the top-k similar movies of every movie"""
+        import numpy as np
+        
+        top_k = top_k or Config.CONTENT_TOP_K
+        block_size = block_size or Config.CONTENT_BLOCK_SIZE
+        computed_at = datetime.utcnow()
+        
+        movies = list(self.movies.find({}, self._projection()))
+        if not movies:
+            return {'movies': 0, 'computed_at': computed_at}
+        
+        # Smoothed IDF over the hashed columns
+        document_frequency = np.zeros(Config.CONTENT_HASH_DIM, dtype=np.float32)
+        for movie in movies:
+            document_frequency[list(self._term_weights(movie))] += 1
+        idf = (np.log((1 + len(movies)) / (1 + document_frequency)) + 1).astype(np.float32)
+        
+        matrix = self._matrix(movies, idf)
+        transposed = matrix.T.tocsc()
+        
+        for start in range(0, len(movies), block_size):
+            # One dense block of rows at a time bounds memory to block_size x movies
+            block = (matrix[start:start + block_size] @ transposed).toarray()
+            operations = []
+            for offset, scores in enumerate(block):
+                row = start + offset
+                scores[row] = 0.0
+                similar = [
+                    self._card(movies[j], scores[j])
+                    for j in self._top(scores, top_k) if scores[j] > 0
+                ]
+                operations.append(UpdateOne(
+                    {'_id': movies[row]['_id']},
+                    {'$set': {'similar': similar}}
+                ))
+            
+            self.movies.bulk_write(operations, ordered=False)
+        
+        self.model.replace_one(
+            {'_id': 'idf'},
+            {
+                'dim': Config.CONTENT_HASH_DIM,
+                'documents': len(movies),
+                'idf': idf.tobytes(),
+                'computed_at': computed_at
+            },
+            upsert=True
+        )
+        self._idf = idf
+        self._idf_computed_at = computed_at
+        
+        return {'movies': len(movies), 'computed_at': computed_at}
+    
+    def _load_idf(self):
+        """Get the IDF weights of the last build, re-reading them after a rebuild"""
+        current = self.model.find_one({'_id': 'idf'}, {'computed_at': 1, 'dim': 1})
+        if not current or current['dim'] != Config.CONTENT_HASH_DIM:
+            return None
+        
+        if current['computed_at'] != self._idf_computed_at:
+            import numpy as np
+            doc = self.model.find_one({'_id': 'idf'})
+            self._idf = np.frombuffer(doc['idf'], dtype=np.float32)
+            self._idf_computed_at = doc['computed_at']
+        return self._idf
+    
+    def place_later(self, movie):
+        """Queue a new movie for add_movie() on the background worker"""
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._drain, daemon=True)
+                self._worker.start()
+        
+        try:
+            self._queue.put_nowait(movie)
+        except queue.Full:
+            # The next build() places it along with the rest of the catalog
+            pass
+    
+    def _drain(self):
+        """Place queued movies one at a time"""
+        while True:
+            movie = self._queue.get()
+            try:
+                self.add_movie(movie)
+            except Exception as e:
+                print(f"Error placing similar movies: {str(e)}")
+    
+    def add_movie(self, movie):
+        """Find similar movies for a new movie and offer it to theirs
+        
+        Candidates are the most viewed movies sharing a genre or production
+        house; the next build() rescores the whole catalog.
+        """
+        idf = self._load_idf()
+        if idf is None:
+            return
+        
+        movie_id = ObjectId(movie['_id'])
+        clauses = []
+        if movie.get('genres'):
+            clauses.append({'genres': {'$in': movie['genres']}})
+        if movie.get('production_houses'):
+            clauses.append({'production_houses': {'$in': movie['production_houses']}})
+        if not clauses:
+            return
+        
+        candidates = list(self.movies.find(
+            {'$or': clauses, '_id': {'$ne': movie_id}},
+            self._projection()
+        ).sort([('view_count', -1), ('_id', 1)]).limit(Config.CONTENT_CANDIDATES))
+        if not candidates:
+            return
+        
+        matrix = self._matrix([movie] + candidates, idf)
+        scores = (matrix[1:] @ matrix[0].T).toarray().ravel()
+        
+        similar = [
+            self._card(candidates[j], scores[j])
+            for j in self._top(scores, Config.CONTENT_TOP_K) if scores[j] > 0
+        ]
+        operations = [UpdateOne({'_id': movie_id}, {'$set': {'similar': similar}})]
+        
+        # Each candidate keeps its top-k, now possibly including this movie;
+        # candidates whose k-th entry already scores higher are left alone
+        card = self._card({**movie, '_id': movie_id}, 0)
+        last = f"similar.{Config.CONTENT_TOP_K - 1}"
+        for candidate, score in zip(candidates, scores):
+            score = round(float(score), 4)
+            if score <= 0:
+                continue
+            operations.append(UpdateOne(
+                {
+                    '_id': candidate['_id'],
+                    'similar.movie_id': {'$ne': card['movie_id']},
+                    '$or': [{last: {'$exists': False}}, {f"{last}.score": {'$lt': score}}]
+                },
+                {'$push': {'similar': {
+                    '$each': [{**card, 'score': score}],
+                    '$sort': {'score': -1},
+                    '$slice': Config.CONTENT_TOP_K
+                }}}
+            ))
+        
+        self.movies.bulk_write(operations, ordered=False)
@@ -0,0 +1,99 @@
+import atexit
+import os
+import threading
+import weakref
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from config import Config
+
+# Every live buffer, so pending counts can be flushed when the worker exits
+_buffers = weakref.WeakSet()
+
+class CounterBuffer:
+    """Gather counter increments in memory and write them as one bulk $inc"""
+    
+    def __init__(self, collection, field, flush_interval=None, max_pending=None):
+        self.collection = collection
+        self.field = field
+        self.flush_interval = flush_interval or Config.COUNTER_FLUSH_INTERVAL
+        self.max_pending = max_pending or Config.COUNTER_FLUSH_THRESHOLD
+        self._counts = {}
+        self._lock = threading.Lock()
+        self._flusher = None
+        self._flusher_pid = None
+        self._stopped = threading.Event()
+        _buffers.add(self)
+    
+    def increment(self, key, amount=1):
+        """Record an increment for a document, flushing if the buffer is full"""
+        self._ensure_flusher()
+        
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + amount
+            full = len(self._counts) >= self.max_pending
+        
+        if full:
+            self.flush()
+    
+    def flush(self):
+        """Write all pending increments in one unordered bulk write"""
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        
+        if not counts:
+            return 0
+        
+        pending = list(counts.items())
+        operations = [self._operation(key, amount) for key, amount in pending]
+        try:
+            self.collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            print(f"Error flushing {self.field} counters: {str(e)}")
+            # The other operations were applied; only the failed ones are retried
+            failed = [pending[error['index']] for error in e.details.get('writeErrors', [])]
+            self._requeue(failed)
+            return len(operations) - len(failed)
+        except Exception as e:
+            print(f"Error flushing {self.field} counters: {str(e)}")
+            # Keep the counts for the next flush rather than losing them
+            self._requeue(pending)
+            return 0
+        
+        return len(operations)
+    
+    def _requeue(self, pending):
+        """Add (key, amount) pairs back for the next flush"""
+        with self._lock:
+            for key, amount in pending:
+                self._counts[key] = self._counts.get(key, 0) + amount
+    
+    def _operation(self, key, amount):
+        """Build the bulk write operation for one key"""
+        return UpdateOne({'_id': ObjectId(key)}, {'$inc': {self.field: amount}})
+    
+    def _ensure_flusher(self):
+        """Start the background flush thread in this process if needed"""
+        # Threads do not survive a fork, so workers each start their own
+        if self._flusher_pid == os.getpid() and self._flusher.is_alive():
+            return
+        
+        with self._lock:
+            if self._flusher_pid == os.getpid() and self._flusher.is_alive():
+                return
+            self._flusher = threading.Thread(target=self._run, daemon=True)
+            self._flusher_pid = os.getpid()
+            self._flusher.start()
+    
+    def _run(self):
+        """Flush on a fixed interval until the process exits"""
+        while not self._stopped.wait(self.flush_interval):
+            self.flush()
+
+def flush_all():
+    """Flush every buffer; registered to run when the worker shuts down"""
+    for buffer in list(_buffers):
+        buffer._stopped.set()
+        buffer.flush()
+
+atexit.register(flush_all)
@@ -0,0 +1,57 @@
+import hashlib
+from functools import wraps
+from flask import make_response, request
+from config import Config
+
+def version_etag(version):
+    """Build a strong ETag from a document's version fields (updated_at, counters)"""
+    parts = [f"{key}={version[key]}" for key in sorted(version)]
+    return hashlib.sha1('&'.join(parts).encode('utf-8')).hexdigest()
+
+def http_cache(name, etag=None):
+    """Add a strong ETag and the Cache-Control policy in Config.HTTP_CACHE_POLICIES[name]
+    
+    Requests whose If-None-Match matches the ETag get an empty 304.
+    Responses that already carry an ETag (e.g. replayed by the response
+    cache) are not hashed again.
+    
+    etag, when given, is called with the view's arguments and returns the
+    ETag from a light read (or None), so a matching request is answered
+    before the view reads and serializes the full document.
+    """
+    policy = Config.HTTP_CACHE_POLICIES.get(name, {})
+    
+    def apply_policy(response):
+        if policy.get('private'):
+            response.cache_control.private = True
+        else:
+            response.cache_control.public = True
+        response.cache_control.max_age = policy.get('max_age', 0)
+        if policy.get('s_maxage') is not None:
+            response.cache_control.s_maxage = policy['s_maxage']
+    
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            validator = etag(*args, **kwargs) if etag else None
+            if validator and request.if_none_match.contains(validator):
+                response = make_response('', 304)
+                response.set_etag(validator)
+                apply_policy(response)
+                return response
+            
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            
+            if validator:
+                response.set_etag(validator)
+            elif not response.get_etag()[0]:
+                response.add_etag()
+            
+            apply_policy(response)
+            return response.make_conditional(request)
+        
+        return wrapper
+    
+    return decorator
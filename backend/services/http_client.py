@@ -0,0 +1,85 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import Config
+
+class HTTPClient:
+    """Pooled keep-alive HTTP session for a single outbound upstream"""
+    
+    def __init__(self, name, pool_size=10, connect_timeout=3.05, read_timeout=10,
+                 retries=2, backoff=0.3):
+        self.name = name
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        
+        # Retry connection errors and transient upstream failures with backoff.
+        # 429s are not retried here: retries would spend quota without going
+        # through the caller's rate limiter
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+            raise_on_status=False
+        )
+        
+        self.adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=retry
+        )
+        
+        self.session = requests.Session()
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+    
+    def get(self, url, **kwargs):
+        """Send a GET request over the pooled session"""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
+    
+    def get_pool_stats(self):
+        """Get connection reuse counters for this upstream"""
+        pools = self.adapter.poolmanager.pools
+        requests_sent = 0
+        connections_opened = 0
+        idle_connections = 0
+        
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            requests_sent += pool.num_requests
+            connections_opened += pool.num_connections
+            idle_connections += pool.pool.qsize() if pool.pool else 0
+        
+        reused = max(requests_sent - connections_opened, 0)
+        
+        return {
+            'requests': requests_sent,
+            'connections_opened': connections_opened,
+            'connections_reused': reused,
+            'idle_connections': idle_connections,
+            'reuse_ratio': round(reused / requests_sent, 4) if requests_sent else 0.0,
+            'pool_size': self.pool_size,
+            'timeout': {'connect': self.timeout[0], 'read': self.timeout[1]}
+        }
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_client(name):
+    """Get the shared client for an upstream configured in Config.HTTP_UPSTREAMS"""
+    with _clients_lock:
+        client = _clients.get(name)
+        if client is None:
+            client = HTTPClient(name, **Config.HTTP_UPSTREAMS.get(name, {}))
+            _clients[name] = client
+        return client
+
+def get_pool_stats():
+    """Get pool stats for every upstream client created in this process"""
+    with _clients_lock:
+        clients = list(_clients.values())
+    return {client.name: client.get_pool_stats() for client in clients}
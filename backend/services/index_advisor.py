@@ -0,0 +1,131 @@
+import random
+from datetime import datetime
+from bson import json_util
+from config import Config
+
+class IndexAdvisor:
+    """Sample real queries and explain them to find shapes that need an index"""
+    
+    def __init__(self, db):
+        self.db = db
+        self.samples = db.query_samples
+        self.samples.create_index('created_at', expireAfterSeconds=Config.QUERY_SAMPLE_TTL)
+        self.samples.create_index([('collection', 1), ('created_at', -1)])
+    
+    @staticmethod
+    def query_shape(query, sort):
+        """Describe a query by its fields and operators, ignoring values"""
+        def describe(value):
+            if isinstance(value, dict):
+                return '{' + ','.join(f"{k}:{describe(v)}" for k, v in sorted(value.items())) + '}'
+            if isinstance(value, list):
+                return '[' + ','.join(describe(v) for v in value) + ']'
+            return '?'
+        
+        sort_part = ','.join(f"{field}:{order}" for field, order in sort)
+        return f"{describe(query)} sort={sort_part}"
+    
+    def record(self, collection, query, sort):
+        """Keep a sample of a query for later analysis"""
+        if random.random() >= Config.QUERY_SAMPLE_RATE:
+            return
+        
+        try:
+            self.samples.insert_one({
+                'collection': collection,
+                'shape': self.query_shape(query, sort),
+                # Serialized because filters contain $-prefixed keys
+                'query': json_util.dumps(query),
+                'sort': [[field, order] for field, order in sort],
+                'created_at': datetime.utcnow()
+            })
+        except Exception as e:
+            print(f"Error recording query sample: {str(e)}")
+    
+    def report(self, collection='movies', sample_size=500, limit=None):
+        """Explain one recent query per sampled shape and flag costly plans"""
+        pipeline = [
+            {'$match': {'collection': collection}},
+            {'$sort': {'created_at': -1}},
+            {'$limit': sample_size},
+            {'$group': {
+                '_id': '$shape',
+                'count': {'$sum': 1},
+                'query': {'$first': '$query'},
+                'sort': {'$first': '$sort'}
+            }},
+            {'$sort': {'count': -1}}
+        ]
+        
+        shapes = []
+        for sample in self.samples.aggregate(pipeline):
+            stats = self._explain(
+                collection,
+                json_util.loads(sample['query']),
+                sample['sort'],
+                limit or Config.ITEMS_PER_PAGE + 1
+            )
+            stats['shape'] = sample['_id']
+            stats['samples'] = sample['count']
+            shapes.append(stats)
+        
+        return {
+            'collection': collection,
+            'shapes': shapes,
+            'needs_index': [s['shape'] for s in shapes if s['collection_scan'] or s['in_memory_sort']]
+        }
+    
+    def _explain(self, collection, query, sort, limit):
+        """Run explain(executionStats) for a find and summarise the plan"""
+        command = {
+            'explain': {
+                'find': collection,
+                'filter': query,
+                'sort': {field: order for field, order in sort},
+                'limit': limit
+            },
+            'verbosity': 'executionStats'
+        }
+        result = self.db.command(command)
+        
+        planner = result.get('queryPlanner', {})
+        winning_plan = planner.get('winningPlan', {})
+        # Plans from the slot-based engine nest the classic tree one level down
+        winning_plan = winning_plan.get('queryPlan', winning_plan)
+        stages, indexes = self._plan_stages(winning_plan)
+        
+        execution = result.get('executionStats', {})
+        examined = execution.get('totalDocsExamined', 0)
+        returned = execution.get('nReturned', 0)
+        
+        return {
+            'collection_scan': 'COLLSCAN' in stages,
+            'in_memory_sort': 'SORT' in stages,
+            'indexes_used': indexes,
+            'stages': stages,
+            'docs_examined': examined,
+            'keys_examined': execution.get('totalKeysExamined', 0),
+            'returned': returned,
+            'examined_per_returned': round(examined / returned, 2) if returned else examined,
+            'execution_ms': execution.get('executionTimeMillis', 0)
+        }
+    
+    def _plan_stages(self, plan):
+        """Collect stage names and index names from a plan tree"""
+        stages = []
+        indexes = []
+        pending = [plan]
+        
+        while pending:
+            node = pending.pop()
+            if not node:
+                continue
+            if node.get('stage'):
+                stages.append(node['stage'])
+            if node.get('indexName'):
+                indexes.append(node['indexName'])
+            if node.get('inputStage'):
+                pending.append(node['inputStage'])
+            pending.extend(node.get('inputStages', []))
+        
+        return stages, indexes
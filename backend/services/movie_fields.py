@@ -0,0 +1,106 @@
+import re
+import unicodedata
+from config import Config
+
+# Bump when derive_catalog_fields changes so the backfill runs again
+CATALOG_FIELDS_VERSION = 4
+
+# Raw OMDb fields that derive_catalog_fields reads
+CATALOG_SOURCE_FIELDS = [
+    'title', 'production', 'production_house', 'genre', 'language', 'country', 'year', 'imdb_rating',
+    'imdb_votes', 'runtime', 'metascore', 'box_office'
+]
+
+_YEAR_PATTERN = re.compile(r'\d{4}')
+_NUMBER_PATTERN = re.compile(r'\d[\d,]*(?:\.\d+)?')
+_NON_WORD_PATTERN = re.compile(r'[^\w]+')
+
+def split_list_field(value):
+    """Split an OMDb comma list such as "Action, Sci-Fi" into lowercase values"""
+    if not value or value == 'N/A':
+        return []
+    
+    values = []
+    for part in value.split(','):
+        part = part.strip().lower()
+        if part and part not in values:
+            values.append(part)
+    return values
+
+def parse_year_range(value):
+    """Parse an OMDb year such as "2019", "2019–2022" or "2019–" into (start, end)"""
+    years = _YEAR_PATTERN.findall(value or '')
+    if not years:
+        return None, None
+    
+    start = int(years[0])
+    if len(years) > 1:
+        return start, int(years[1])
+    
+    # A trailing dash marks a series that is still running
+    if value.strip().endswith(('–', '-')):
+        return start, None
+    return start, start
+
+def parse_number(value, cast=float):
+    """Parse the first number in an OMDb string such as '142 min' or '$858,373,000'"""
+    if not isinstance(value, str):
+        return cast(value) if isinstance(value, (int, float)) else None
+    
+    match = _NUMBER_PATTERN.search(value)
+    if not match:
+        return None
+    return cast(float(match.group().replace(',', '')))
+
+def fold_title(value):
+    """Normalize a title for matching: 'Amélie (2001)!' becomes 'amelie 2001'"""
+    if not isinstance(value, str):
+        return ''
+    
+    decomposed = unicodedata.normalize('NFKD', value.casefold())
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(_NON_WORD_PATTERN.sub(' ', stripped).replace('_', ' ').split())
+
+def _compile_house_matcher():
+    """Compile every production house name and alias into one alternation"""
+    canonical = {}
+    for house in Config.PRODUCTION_HOUSES:
+        for name in [house] + Config.PRODUCTION_HOUSE_ALIASES.get(house, []):
+            canonical.setdefault(fold_title(name), house)
+    
+    # Longest names first so "walt disney pictures" wins over "disney"
+    names = sorted(canonical, key=len, reverse=True)
+    pattern = re.compile(r'(?<!\w)(?:' + '|'.join(map(re.escape, names)) + r')(?!\w)')
+    return pattern, canonical
+
+_HOUSE_PATTERN, _HOUSE_NAMES = _compile_house_matcher()
+
+def match_production_houses(value):
+    """Get every known production house named in an OMDb production string, in order"""
+    houses = []
+    for match in _HOUSE_PATTERN.finditer(fold_title(value)):
+        house = _HOUSE_NAMES[match.group()]
+        if house not in houses:
+            houses.append(house)
+    return houses
+
+def derive_catalog_fields(movie):
+    """Compute the indexed fields derived from a movie's OMDb strings"""
+    year_start, year_end = parse_year_range(movie.get('year'))
+    
+    return {
+        'title_folded': fold_title(movie.get('title')),
+        # Seeded movies may only carry the house they were seeded under
+        'production_houses': (match_production_houses(movie.get('production'))
+                              or match_production_houses(movie.get('production_house'))),
+        'genres': split_list_field(movie.get('genre')),
+        'languages': split_list_field(movie.get('language')),
+        'countries': split_list_field(movie.get('country')),
+        'year_start': year_start,
+        'year_end': year_end,
+        'rating_num': parse_number(movie.get('imdb_rating')),
+        'votes_num': parse_number(movie.get('imdb_votes'), int),
+        'runtime_min': parse_number(movie.get('runtime'), int),
+        'metascore_num': parse_number(movie.get('metascore'), int),
+        'box_office_usd': parse_number(movie.get('box_office'), int)
+    }
@@ -1,6 +1,8 @@
 import requests
 import time
+from datetime import datetime
 from services.omdb_service import OMDbService
+from services.movie_fields import match_production_houses
 from config import Config
 
 class MovieSeeder:
@@ -8,7 +10,7 @@ class MovieSeeder:
     
     def __init__(self, db):
         self.db = db
-        self.omdb_service = OMDbService()
+        self.omdb_service = OMDbService(db[Config.DATABASE_NAME])
         self.movies_collection = db[Config.DATABASE_NAME]['movies']
         
         # Popular movies to seed for each production house
@@ -65,6 +67,13 @@ class MovieSeeder:
             ]
         }
     
+    def _insert_movie(self, movie_data):
+        """Insert a seeded movie, stamped like Movie.create_movie so title index syncs see it"""
+        now = datetime.utcnow()
+        movie_data['created_at'] = now
+        movie_data['updated_at'] = now
+        self.movies_collection.insert_one(movie_data)
+    
     def seed_all_movies(self):
         """Seed movies from all production houses"""
         print("🎬 Starting movie seeding process...")
@@ -111,15 +120,15 @@ class MovieSeeder:
                     # Override production house if needed
                     if not movie_data.get('production_house'):
                         movie_data['production_house'] = production_house
+                        movie_data['production_houses'] = match_production_houses(production_house)
                     
                     # Add metadata
                     movie_data['view_count'] = 0
-                    movie_data['user_ratings'] = []
-                    movie_data['reviews'] = []
+                    movie_data['review_count'] = 0
                     movie_data['seeded'] = True
                     
                     # Insert into database
-                    self.movies_collection.insert_one(movie_data)
+                    self._insert_movie(movie_data)
                     print(f"   ✅ Added: {title}")
                     added += 1
                 else:
@@ -134,8 +143,12 @@ class MovieSeeder:
         return added, skipped
     
     def seed_trending_movies(self):
-        """Seed currently trending movies"""
-        print("🔥 Seeding trending movies...")
+        """Seed recent popular releases
+        
+        Trending comes from real views only, so these start with no views
+        like every other movie.
+        """
+        print("🔥 Seeding recent popular movies...")
         
         trending_titles = [
             'Oppenheimer', 'Barbie', 'The Super Mario Bros. Movie',
@@ -148,28 +161,19 @@ class MovieSeeder:
         for title in trending_titles:
             try:
                 existing = self.movies_collection.find_one({'title': title})
-                if existing:
-                    # Update view count to make it trending
-                    self.movies_collection.update_one(
-                        {'_id': existing['_id']},
-                        {'$set': {'view_count': 1000 + (added * 100)}}
-                    )
-                    added += 1
-                else:
+                if not existing:
                     movie_data = self.omdb_service.fetch_movie_by_title(title)
                     if movie_data:
-                        movie_data['view_count'] = 1000 + (added * 100)
-                        movie_data['user_ratings'] = []
-                        movie_data['reviews'] = []
-                        movie_data['trending'] = True
-                        self.movies_collection.insert_one(movie_data)
+                        movie_data['view_count'] = 0
+                        movie_data['review_count'] = 0
+                        self._insert_movie(movie_data)
                         added += 1
                 
                 time.sleep(0.5)
             except Exception as e:
                 print(f"   ❌ Error: {str(e)}")
         
-        print(f"✅ Added {added} trending movies")
+        print(f"✅ Added {added} recent popular movies")
         return added
     
     def seed_top_rated_movies(self):
@@ -189,11 +193,10 @@ class MovieSeeder:
                 if not existing:
                     movie_data = self.omdb_service.fetch_movie_by_title(title)
                     if movie_data:
-                        movie_data['view_count'] = 500
-                        movie_data['user_ratings'] = []
-                        movie_data['reviews'] = []
+                        movie_data['view_count'] = 0
+                        movie_data['review_count'] = 0
                         movie_data['top_rated'] = True
-                        self.movies_collection.insert_one(movie_data)
+                        self._insert_movie(movie_data)
                         added += 1
                 
                 time.sleep(0.5)
@@ -222,10 +225,9 @@ class MovieSeeder:
                 if not existing:
                     movie_data = self.omdb_service.fetch_movie_by_title(title)
                     if movie_data:
-                        movie_data['view_count'] = 100
-                        movie_data['user_ratings'] = []
-                        movie_data['reviews'] = []
-                        self.movies_collection.insert_one(movie_data)
+                        movie_data['view_count'] = 0
+                        movie_data['review_count'] = 0
+                        self._insert_movie(movie_data)
                         print(f"   ✅ Added: {title}")
                         added += 1
                 
@@ -240,7 +242,10 @@ class MovieSeeder:
         """Get current seeding status"""
         total_movies = self.movies_collection.count_documents({})
         seeded_movies = self.movies_collection.count_documents({'seeded': True})
-        trending_movies = self.movies_collection.count_documents({'view_count': {'$gte': 1000}})
+        
+        # Movies on the materialized global trending list
+        trending = self.db[Config.DATABASE_NAME]['trending'].find_one({'_id': 'global'}, {'movies': 1})
+        trending_movies = len(trending['movies']) if trending else 0
         
         return {
             'total_movies': total_movies,
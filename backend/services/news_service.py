@@ -1,6 +1,6 @@
-import requests
 from datetime import datetime
 from config import Config
+from services.http_client import get_client
 
 class NewsService:
     """Service for fetching entertainment news from external APIs"""
@@ -13,6 +13,7 @@ class NewsService:
         # You can get a free API key from https://newsapi.org/
         self.newsapi_key = '854b2e8293b54de1a12a4531162bcf15'
         self.newsapi_url = 'https://newsapi.org/v2/everything'
+        self.http = get_client('newsapi')
         
         # Fallback: Use mock news if API key not available
         self.use_mock = False  # Set to False when you have a real API key
@@ -32,7 +33,7 @@ class NewsService:
                 'pageSize': limit
             }
             
-            response = requests.get(self.newsapi_url, params=params, timeout=10)
+            response = self.http.get(self.newsapi_url, params=params)
             data = response.json()
             
             if data.get('status') == 'ok':
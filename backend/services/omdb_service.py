@@ -1,24 +1,148 @@
-import requests
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from config import Config
+from services.http_client import get_client
+from services.movie_fields import derive_catalog_fields, match_production_houses
+from services.rate_limiter import TokenBucket
+
+class OMDbCache:
+    """Two-tier cache for OMDb responses: in-process LRU in front of MongoDB"""
+    
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.collection = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'persistent_hits': 0, 'misses': 0}
+    
+    def bind(self, db):
+        """Attach the persistent store (omdb_cache collection)"""
+        if self.collection is not None:
+            return
+        self.collection = db.omdb_cache
+        # Let MongoDB expire stale entries on its own
+        self.collection.create_index('expires_at', expireAfterSeconds=0)
+    
+    @staticmethod
+    def make_key(params):
+        """Build a cache key from normalized request parameters"""
+        parts = []
+        for name in sorted(params):
+            value = ' '.join(str(params[name]).split()).lower()
+            parts.append(f"{name}={value}")
+        return '&'.join(parts)
+    
+    def get(self, key):
+        """Get a cached response, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return entry[1]
+            if entry:
+                del self._entries[key]
+        
+        if self.collection is not None:
+            try:
+                doc = self.collection.find_one({
+                    '_id': key,
+                    'expires_at': {'$gt': datetime.utcnow()}
+                })
+                if doc:
+                    ttl = (doc['expires_at'] - datetime.utcnow()).total_seconds()
+                    self._remember(key, doc['data'], now + ttl)
+                    with self._lock:
+                        self._stats['persistent_hits'] += 1
+                    return doc['data']
+            except Exception as e:
+                print(f"Error reading OMDb cache: {str(e)}")
+        
+        with self._lock:
+            self._stats['misses'] += 1
+        return None
+    
+    def set(self, key, data, ttl):
+        """Store a response in both cache tiers"""
+        self._remember(key, data, time.time() + ttl)
+        
+        if self.collection is not None:
+            try:
+                self.collection.replace_one(
+                    {'_id': key},
+                    {
+                        'data': data,
+                        'expires_at': datetime.utcnow() + timedelta(seconds=ttl)
+                    },
+                    upsert=True
+                )
+            except Exception as e:
+                print(f"Error writing OMDb cache: {str(e)}")
+    
+    def _remember(self, key, data, expires_at):
+        """Put an entry in the in-process LRU, evicting the oldest if full"""
+        with self._lock:
+            self._entries[key] = (expires_at, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def get_stats(self):
+        """Get hit/miss counters for the cache"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['persistent_hits'] + stats['misses']
+        stats['hit_ratio'] = round((lookups - stats['misses']) / lookups, 4) if lookups else 0.0
+        return stats
+
+# Shared by every OMDbService instance in this process
+omdb_cache = OMDbCache(Config.OMDB_CACHE_MAX_ENTRIES)
+omdb_rate_limiter = TokenBucket(Config.OMDB_RATE_PER_SECOND, Config.OMDB_RATE_BURST)
 
 class OMDbService:
     """Service for interacting with OMDb API"""
     
-    def __init__(self):
+    def __init__(self, db=None):
         self.api_key = Config.OMDB_API_KEY
         self.base_url = Config.OMDB_API_URL
+        self.http = get_client('omdb')
+        self.cache = omdb_cache
+        self.rate_limiter = omdb_rate_limiter
+        
+        if db is not None:
+            self.cache.bind(db)
+    
+    def _request(self, params, ttl):
+        """Call OMDb, answering repeated requests from the cache"""
+        key = self.cache.make_key(params)
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+        
+        self.rate_limiter.acquire()
+        response = self.http.get(self.base_url, params={**params, 'apikey': self.api_key})
+        data = response.json()
+        
+        # Only cache real answers, never errors such as an exhausted key
+        if data.get('Response') == 'True':
+            self.cache.set(key, data, ttl)
+        
+        return data
     
     def fetch_movie_by_imdb_id(self, imdb_id):
         """Fetch movie details by IMDb ID"""
         try:
             params = {
-                'apikey': self.api_key,
                 'i': imdb_id,
                 'plot': 'full'
             }
             
-            response = requests.get(self.base_url, params=params)
-            data = response.json()
+            data = self._request(params, Config.OMDB_DETAIL_CACHE_TTL)
             
             if data.get('Response') == 'True':
                 return self._format_movie_data(data)
@@ -28,11 +152,19 @@ class OMDbService:
             print(f"Error fetching movie: {str(e)}")
             return None
     
+    def fetch_movies_by_imdb_ids(self, imdb_ids):
+        """Fetch details for several movies concurrently, in the given order"""
+        if not imdb_ids:
+            return []
+        
+        workers = min(Config.OMDB_MAX_WORKERS, len(imdb_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.fetch_movie_by_imdb_id, imdb_ids))
+    
     def search_movies(self, title, year=None, page=1):
         """Search movies by title"""
         try:
             params = {
-                'apikey': self.api_key,
                 's': title,
                 'page': page
             }
@@ -40,8 +172,7 @@ class OMDbService:
             if year:
                 params['y'] = year
             
-            response = requests.get(self.base_url, params=params)
-            data = response.json()
+            data = self._request(params, Config.OMDB_SEARCH_CACHE_TTL)
             
             if data.get('Response') == 'True':
                 return {
@@ -58,7 +189,6 @@ class OMDbService:
         """Fetch movie details by title"""
         try:
             params = {
-                'apikey': self.api_key,
                 't': title,
                 'plot': 'full'
             }
@@ -66,8 +196,7 @@ class OMDbService:
             if year:
                 params['y'] = year
             
-            response = requests.get(self.base_url, params=params)
-            data = response.json()
+            data = self._request(params, Config.OMDB_DETAIL_CACHE_TTL)
             
             if data.get('Response') == 'True':
                 return self._format_movie_data(data)
@@ -79,7 +208,7 @@ class OMDbService:
     
     def _format_movie_data(self, data):
         """Format OMDb API response to our movie model"""
-        return {
+        movie = {
             'imdb_id': data.get('imdbID'),
             'title': data.get('Title'),
             'year': data.get('Year'),
@@ -106,6 +235,9 @@ class OMDbService:
             'website': data.get('Website'),
             'production_house': self._extract_production_house(data)
         }
+        
+        movie.update(derive_catalog_fields(movie))
+        return movie
     
     def _format_ratings(self, ratings):
         """Format ratings from OMDb"""
@@ -118,13 +250,13 @@ class OMDbService:
         return formatted
     
     def _extract_production_house(self, data):
-        """Extract production house from movie data"""
-        production = data.get('Production', '')
+        """Extract the main production house from movie data"""
+        production = data.get('Production') or ''
         
         # Check against our list of production houses
-        for house in Config.PRODUCTION_HOUSES:
-            if house.lower() in production.lower():
-                return house
+        houses = match_production_houses(production)
+        if houses:
+            return houses[0]
         
         return production if production != 'N/A' else ''
     
@@ -134,20 +266,22 @@ class OMDbService:
         # This is a workaround using search
         try:
             params = {
-                'apikey': self.api_key,
                 's': production_house,
                 'page': page
             }
             
-            response = requests.get(self.base_url, params=params)
-            data = response.json()
+            data = self._request(params, Config.OMDB_SEARCH_CACHE_TTL)
             
             if data.get('Response') == 'True':
+                # Fetch full details for all results concurrently
+                imdb_ids = [movie.get('imdbID') for movie in data.get('Search', [])]
+                
+                # Keep movies crediting the house anywhere, not just first;
+                # aliases such as "20th Century Fox" resolve to the canonical name
+                wanted = set(match_production_houses(production_house) or [production_house])
                 movies = []
-                for movie in data.get('Search', []):
-                    # Fetch full details for each movie
-                    full_data = self.fetch_movie_by_imdb_id(movie.get('imdbID'))
-                    if full_data and production_house.lower() in full_data.get('production_house', '').lower():
+                for full_data in self.fetch_movies_by_imdb_ids(imdb_ids):
+                    if full_data and wanted & set(full_data.get('production_houses', [])):
                         movies.append(full_data)
                 
                 return movies
@@ -0,0 +1,115 @@
+import base64
+import binascii
+from datetime import datetime
+from bson import ObjectId, json_util
+from flask import request, jsonify
+from config import Config
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+# Types a sort key can hold; anything else (operators, regexes) is rejected
+CURSOR_VALUE_TYPES = (str, int, float, datetime, type(None))
+
+def clamp_limit(limit):
+    """Keep a requested page size within the server-side cap"""
+    return max(1, min(limit, Config.MAX_PAGE_SIZE))
+
+def encode_cursor(value, last_id):
+    """Encode the last sort key and _id of a page as an opaque token"""
+    payload = json_util.dumps({'v': value, 'id': last_id})
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(token):
+    """Decode a token produced by encode_cursor into (value, last_id)"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json_util.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        value, last_id = payload['v'], payload['id']
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError):
+        raise InvalidCursor('Invalid pagination cursor')
+    
+    # Both values go straight into the query, so clients must not smuggle in operators
+    if not isinstance(value, CURSOR_VALUE_TYPES) or not isinstance(last_id, ObjectId):
+        raise InvalidCursor('Invalid pagination cursor')
+    return value, last_id
+
+def _keyset_filter(sort_field, sort_order, value, last_id):
+    """Match documents that sort strictly after (value, last_id)"""
+    op = '$lt' if sort_order < 0 else '$gt'
+    
+    if sort_field == '_id':
+        return {'_id': {op: last_id}}
+    
+    tie = {sort_field: value, '_id': {op: last_id}}
+    
+    # Missing values sort first ascending and last descending
+    if value is None:
+        if sort_order < 0:
+            return tie
+        return {'$or': [tie, {sort_field: {'$ne': None}}]}
+    
+    clauses = [{sort_field: {op: value}}, tie]
+    if sort_order < 0:
+        clauses.append({sort_field: None})
+    return {'$or': clauses}
+
+def paginate(collection, query, sort_field, sort_order=-1, limit=20, cursor=None,
+             skip=0, projection=None):
+    """Fetch one page ordered by (sort_field, _id), returning (docs, next_cursor)
+    
+    With a cursor the page starts right after the previous one; skip is
+    only honoured for clients that have not moved to cursors yet.
+    """
+    if cursor:
+        value, last_id = decode_cursor(cursor)
+        query = {'$and': [query, _keyset_filter(sort_field, sort_order, value, last_id)]}
+        skip = 0
+    
+    sort = [('_id', sort_order)]
+    injected = False
+    if sort_field != '_id':
+        sort.insert(0, (sort_field, sort_order))
+        
+        # The cursor needs the sort key even when the caller projects it away
+        if projection and all(projection.values()) and sort_field not in projection:
+            projection = {**projection, sort_field: 1}
+            injected = True
+    
+    # Read one extra document to learn whether another page exists
+    docs = list(collection.find(query, projection).sort(sort).skip(skip).limit(limit + 1))
+    
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1].get(sort_field), docs[-1]['_id'])
+    
+    # Callers get exactly the fields they projected
+    if injected:
+        for doc in docs:
+            doc.pop(sort_field, None)
+    
+    return docs, next_cursor
+
+def page_args(default_limit=None):
+    """Read skip, limit and cursor from the query string"""
+    skip = max(request.args.get('skip', 0, type=int), 0)
+    limit = clamp_limit(request.args.get('limit', default_limit or Config.ITEMS_PER_PAGE, type=int))
+    cursor = request.args.get('cursor') or None
+    return skip, limit, cursor
+
+def page_response(items, next_cursor):
+    """Respond with one page of results
+    
+    Clients that send ?cursor= get {items, next_cursor}; older clients keep
+    receiving a bare list, with the next cursor in the X-Next-Cursor header.
+    """
+    if 'cursor' in request.args:
+        response = jsonify({'items': items, 'next_cursor': next_cursor})
+    else:
+        response = jsonify(items)
+    
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    
+    return response
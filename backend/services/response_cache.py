@@ -0,0 +1,168 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import Response, make_response, request
+from pymongo import ReturnDocument
+from config import Config
+
+class ResponseCache:
+    """In-process cache of serialized responses with tag-based invalidation
+    
+    Each entry remembers the version of every tag it depends on. Writers
+    bump a tag's version in MongoDB (cache_tags collection), so entries in
+    every worker go stale within one sync interval.
+    """
+    
+    # Response headers replayed on a cache hit
+    KEPT_HEADERS = ('X-Next-Cursor',)
+    
+    def __init__(self, max_entries, sync_interval=1.0):
+        self.max_entries = max_entries
+        self.sync_interval = sync_interval
+        self.tags = None
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+        self._stats = {}
+    
+    def bind(self, db):
+        """Attach the shared tag version store (cache_tags collection)"""
+        if self.tags is None:
+            self.tags = db.cache_tags
+    
+    @staticmethod
+    def make_key(name, args, view_args, body=None):
+        """Build a cache key from the route name and normalized arguments"""
+        parts = [name]
+        parts.extend(f"{k}={v}" for k, v in sorted(view_args.items()))
+        for k in sorted(args):
+            values = ','.join(sorted(v.strip() for v in args.getlist(k)))
+            parts.append(f"?{k}={values}")
+        if isinstance(body, dict):
+            # Empty criteria do not change the result, so drop them from the key
+            body = {k: v for k, v in body.items() if v not in (None, '', [], {})}
+            parts.append(json.dumps(body, sort_keys=True, default=str))
+        return '&'.join(parts)
+    
+    def _tag_versions(self, tags):
+        """Get the current versions of tags, re-reading them every sync interval"""
+        now = time.monotonic()
+        if self.tags is not None and now - self._synced_at >= self.sync_interval:
+            try:
+                versions = {doc['_id']: doc['version'] for doc in self.tags.find()}
+                with self._lock:
+                    self._versions.update(versions)
+                    self._synced_at = now
+            except Exception as e:
+                print(f"Error reading cache tags: {str(e)}")
+        
+        with self._lock:
+            return {tag: self._versions.get(tag, 0) for tag in tags}
+    
+    def invalidate(self, *tags):
+        """Expire every cached response that depends on any of the tags"""
+        for tag in tags:
+            version = None
+            if self.tags is not None:
+                try:
+                    doc = self.tags.find_one_and_update(
+                        {'_id': tag},
+                        {'$inc': {'version': 1}},
+                        upsert=True,
+                        return_document=ReturnDocument.AFTER
+                    )
+                    version = doc['version']
+                except Exception as e:
+                    print(f"Error invalidating cache tag {tag}: {str(e)}")
+            
+            with self._lock:
+                if version is None:
+                    version = self._versions.get(tag, 0) + 1
+                self._versions[tag] = max(version, self._versions.get(tag, 0))
+    
+    def _count(self, name, outcome):
+        """Record a hit or miss for a route"""
+        with self._lock:
+            stats = self._stats.setdefault(name, {'hits': 0, 'misses': 0})
+            stats[outcome] += 1
+    
+    def get(self, key, name, tags):
+        """Get a cached entry that is neither expired nor invalidated"""
+        versions = self._tag_versions(tags)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry['expires_at'] > time.time() and entry['versions'] == versions:
+                self._entries.move_to_end(key)
+            else:
+                entry = None
+        
+        self._count(name, 'hits' if entry else 'misses')
+        return entry
+    
+    def set(self, key, entry):
+        """Store an entry, evicting the least recently used if full"""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def cached(self, name, tags=()):
+        """Cache successful responses of a view for Config.RESPONSE_CACHE_TTLS[name] seconds"""
+        ttl = Config.RESPONSE_CACHE_TTLS.get(name, Config.RESPONSE_CACHE_DEFAULT_TTL)
+        
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if ttl <= 0:
+                    return view(*args, **kwargs)
+                
+                body = request.get_json(silent=True) if request.method == 'POST' else None
+                key = self.make_key(name, request.args, kwargs, body)
+                entry = self.get(key, name, tags)
+                if entry:
+                    response = Response(entry['body'], status=200, mimetype=entry['mimetype'])
+                    response.headers.extend(entry['headers'])
+                    response.set_etag(entry['etag'])
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+                
+                # Versions are taken before the query so a write that lands
+                # while it runs leaves this entry already stale
+                versions = self._tag_versions(tags)
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200:
+                    response.add_etag()
+                    self.set(key, {
+                        'body': response.get_data(),
+                        'mimetype': response.mimetype,
+                        'headers': [(h, response.headers[h]) for h in self.KEPT_HEADERS
+                                    if h in response.headers],
+                        'etag': response.get_etag()[0],
+                        'versions': versions,
+                        'expires_at': time.time() + ttl
+                    })
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            
+            return wrapper
+        
+        return decorator
+    
+    def get_stats(self):
+        """Get hit/miss counts and hit ratio per route"""
+        with self._lock:
+            routes = {name: dict(stats) for name, stats in self._stats.items()}
+            entries = len(self._entries)
+        
+        for stats in routes.values():
+            lookups = stats['hits'] + stats['misses']
+            stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        
+        return {'entries': entries, 'routes': routes}
+
+# Shared by every blueprint in this process
+response_cache = ResponseCache(Config.RESPONSE_CACHE_MAX_ENTRIES)
@@ -0,0 +1,113 @@
+import math
+from config import Config
+from services.title_index import title_index
+
+class SearchService:
+    """Local-first movie search that only goes to OMDb for what we lack
+    
+    Pages hold SEARCH_PAGE_SIZE results, like OMDb's. Local matches
+    (full-text, then fuzzy title matches) fill the first pages. OMDb is
+    called when there are too few of them or the requested page lies past
+    them, and its results are merged in without titles we already hold.
+    """
+    
+    def __init__(self, movie_model, omdb_service):
+        self.movie_model = movie_model
+        self.omdb_service = omdb_service
+    
+    def search_local(self, query, year=None):
+        """Get local matches as cards: full-text hits first, then fuzzy title matches"""
+        filters = {}
+        if year and year.isdigit():
+            filters['year_start'] = int(year)
+        
+        movies = self.movie_model.search_movies(
+            query, 0, Config.SEARCH_LOCAL_LIMIT, self.movie_model.CARD_PROJECTION, filters
+        )
+        for movie in movies:
+            movie.pop('score', None)
+        
+        # Typos and accent variants find nothing in the text index
+        if len(movies) < Config.SEARCH_MIN_LOCAL_RESULTS:
+            seen = {movie['_id'] for movie in movies}
+            for match in title_index.fuzzy_search(query, Config.SEARCH_PAGE_SIZE):
+                if match['_id'] in seen:
+                    continue
+                if year and not str(match.get('year') or '').startswith(year):
+                    continue
+                match.pop('similarity', None)
+                movies.append(match)
+        
+        return movies
+    
+    @staticmethod
+    def _card_from_omdb(item):
+        """Map an OMDb search hit onto the local card fields
+        
+        OMDb's own keys are kept too, for clients written against the
+        OMDb-shaped results this endpoint used to return.
+        """
+        return {
+            **item,
+            'imdb_id': item.get('imdbID'),
+            'title': item.get('Title'),
+            'year': item.get('Year'),
+            'poster': item.get('Poster'),
+            'type': item.get('Type')
+        }
+    
+    @staticmethod
+    def _omdb_unseen(omdb, local_ids):
+        """OMDb's total less the hits on the fetched page we already hold
+        
+        Overlap on OMDb pages that were not fetched is unknown, so this is
+        an upper bound past the first page.
+        """
+        overlap = sum(1 for item in omdb['results'] if item.get('imdbID') in local_ids)
+        return max(int(omdb['total_results'] or 0) - overlap, 0)
+    
+    def search(self, query, year=None, page=1):
+        """Search one page, returning {results, total_results, has_more, source}"""
+        size = Config.SEARCH_PAGE_SIZE
+        local = self.search_local(query, year)
+        local_ids = {movie.get('imdb_id') for movie in local}
+        enough = len(local) >= Config.SEARCH_MIN_LOCAL_RESULTS
+        local_pages = math.ceil(len(local) / size)
+        
+        if enough and page <= local_pages:
+            total = len(local)
+            has_more = page < local_pages
+            if not has_more:
+                # OMDb pages follow the local ones when it knows titles we
+                # lack; its first page is cached for the request that follows
+                unseen = self._omdb_unseen(self.omdb_service.search_movies(query, year, 1), local_ids)
+                total += unseen
+                has_more = unseen > 0
+            return {
+                'results': local[(page - 1) * size:page * size],
+                'total_results': total,
+                'has_more': has_more,
+                'source': 'local'
+            }
+        
+        # Past the local pages, OMDb pages continue where they stop;
+        # with too few local matches they are shown alongside OMDb's first page
+        omdb_page = page - local_pages if enough else page
+        shown = [] if enough or page > 1 else local
+        omdb = self.omdb_service.search_movies(query, year, omdb_page)
+        
+        # Local documents win over OMDb hits for the same title
+        known = set(local_ids)
+        merged = list(shown)
+        for item in omdb['results']:
+            card = self._card_from_omdb(item)
+            if card['imdb_id'] not in known:
+                known.add(card['imdb_id'])
+                merged.append(card)
+        
+        return {
+            'results': merged,
+            'total_results': len(local) + self._omdb_unseen(omdb, local_ids),
+            'has_more': omdb_page * size < int(omdb['total_results'] or 0),
+            'source': 'merged' if shown else 'omdb'
+        }
@@ -0,0 +1,123 @@
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+class _Call:
+    """An in-progress call that concurrent callers can wait on"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Coalesce concurrent work for the same key into a single execution
+    
+    Threads in a worker share one call per key. When a database is given,
+    workers also coordinate through a short-lived lease document so only
+    one of them does the work while the others poll for its result.
+    """
+    
+    def __init__(self, db=None, namespace='default', lease_seconds=15, poll_interval=0.2):
+        self.namespace = namespace
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.leases = None
+        self._calls = {}
+        self._lock = threading.Lock()
+        
+        if db is not None:
+            self.leases = db.fetch_leases
+            self.leases.create_index('expires_at', expireAfterSeconds=0)
+    
+    def do(self, key, fn, check=None):
+        """Run fn() once for concurrent callers of the same key
+        
+        check() is used to pick up a result produced by another worker;
+        any non-None value it returns is used instead of calling fn().
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+        
+        if not leader:
+            call.done.wait()
+            if call.error:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = self._run_with_lease(key, fn, check)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+    
+    def _run_with_lease(self, key, fn, check):
+        """Run fn() while holding the cross-worker lease for key"""
+        if self.leases is None:
+            return fn()
+        
+        lease_id = f"{self.namespace}:{key}"
+        owner = uuid.uuid4().hex
+        deadline = time.time() + self.lease_seconds
+        
+        while not self._acquire_lease(lease_id, owner):
+            if check:
+                result = check()
+                if result is not None:
+                    return result
+            
+            # The holder looks stuck; stop waiting and do the work ourselves
+            if time.time() >= deadline:
+                return fn()
+            
+            time.sleep(self.poll_interval)
+        
+        try:
+            # Another worker may have finished just before we got the lease
+            if check:
+                result = check()
+                if result is not None:
+                    return result
+            return fn()
+        finally:
+            self._release_lease(lease_id, owner)
+    
+    def _acquire_lease(self, lease_id, owner):
+        """Try to take the lease, including one left behind by a dead holder"""
+        now = datetime.utcnow()
+        lease = {
+            'owner': owner,
+            'expires_at': now + timedelta(seconds=self.lease_seconds)
+        }
+        
+        try:
+            self.leases.insert_one({'_id': lease_id, **lease})
+            return True
+        except DuplicateKeyError:
+            result = self.leases.update_one(
+                {'_id': lease_id, 'expires_at': {'$lte': now}},
+                {'$set': lease}
+            )
+            return result.modified_count > 0
+        except PyMongoError as e:
+            # Coordination is best effort; never block the request on it
+            print(f"Error acquiring lease {lease_id}: {str(e)}")
+            return True
+    
+    def _release_lease(self, lease_id, owner):
+        """Release the lease if we still own it"""
+        try:
+            self.leases.delete_one({'_id': lease_id, 'owner': owner})
+        except PyMongoError as e:
+            print(f"Error releasing lease {lease_id}: {str(e)}")
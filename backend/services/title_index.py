@@ -0,0 +1,260 @@
+import heapq
+import math
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime
+from config import Config
+from services.movie_fields import fold_title
+
+class TitleIndex:
+    """In-memory prefix and trigram index over folded movie titles
+    
+    Keys live in one sorted list, so a prefix is a contiguous range found
+    with two bisects. Titles are also indexed without a leading article,
+    so "matr" finds "The Matrix". Matches are ranked by view count.
+    
+    Each title's trigrams also point back to it, which lets misspelled
+    queries ("shawshank redemtion", "spiderman") find it by the share of
+    their trigrams the title contains.
+    
+    The index is built on a background thread; until the first build is
+    done, lookups return nothing rather than keep a request waiting.
+    """
+    
+    ARTICLES = ('the ', 'a ', 'an ')
+    
+    # Fields kept per movie and returned by suggest()
+    FIELDS = ['imdb_id', 'title', 'year', 'poster']
+    
+    # Prefixes this short match too many titles to rank per request
+    MEMO_PREFIX_LENGTH = 3
+    
+    def __init__(self):
+        self.collection = None
+        self._keys = []
+        self._movies = {}
+        self._trigrams = {}
+        self._lock = threading.RLock()
+        self._memo = {}
+        self._built_at = None
+        self._synced_at = None
+        self._worker = None
+    
+    def bind(self, db):
+        """Attach the movies collection the index is built from"""
+        if self.collection is None:
+            self.collection = db.movies
+    
+    def _keys_for(self, folded):
+        """Index keys for a folded title"""
+        keys = [folded]
+        for article in self.ARTICLES:
+            if folded.startswith(article) and len(folded) > len(article):
+                keys.append(folded[len(article):])
+        return keys
+    
+    @staticmethod
+    def trigrams(folded):
+        """Padded character trigrams of a folded string"""
+        padded = f"  {folded} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+    
+    def _entry(self, movie):
+        """Build the in-memory entry for a movie document"""
+        entry = {field: movie.get(field) for field in self.FIELDS}
+        entry['_id'] = str(movie['_id'])
+        entry['folded'] = movie.get('title_folded') or fold_title(entry['title'])
+        entry['grams'] = frozenset().union(*map(self.trigrams, self._keys_for(entry['folded'])))
+        entry['popularity'] = movie.get('view_count') or 0
+        return entry
+    
+    def _projection(self):
+        """Fields read from MongoDB to build entries"""
+        return {field: 1 for field in self.FIELDS + ['title_folded', 'view_count']}
+    
+    def rebuild(self):
+        """Load every title from MongoDB and swap in a fresh index"""
+        started_at = datetime.utcnow()
+        movies = {}
+        keys = []
+        trigrams = {}
+        for movie in self.collection.find({'title': {'$type': 'string'}}, self._projection()):
+            entry = self._entry(movie)
+            movies[entry['_id']] = entry
+            keys.extend((key, entry['_id']) for key in self._keys_for(entry['folded']))
+            for gram in entry['grams']:
+                trigrams.setdefault(gram, set()).add(entry['_id'])
+        keys.sort()
+        
+        with self._lock:
+            self._keys = keys
+            self._movies = movies
+            self._trigrams = trigrams
+            self._memo = {}
+            self._built_at = time.monotonic()
+            self._synced_at = started_at
+    
+    def add(self, movie):
+        """Add or replace one movie (must include _id and title)"""
+        if not isinstance(movie.get('title'), str):
+            return
+        
+        entry = self._entry(movie)
+        with self._lock:
+            previous = self._movies.get(entry['_id'])
+            if previous:
+                entry['popularity'] = max(entry['popularity'], previous['popularity'])
+                self._remove_keys(previous)
+            self._movies[entry['_id']] = entry
+            for key in self._keys_for(entry['folded']):
+                insort(self._keys, (key, entry['_id']))
+            for gram in entry['grams']:
+                self._trigrams.setdefault(gram, set()).add(entry['_id'])
+            self._memo = {}
+    
+    def remove(self, movie_id):
+        """Drop a deleted movie (other workers lose it at their next rebuild)"""
+        with self._lock:
+            entry = self._movies.pop(str(movie_id), None)
+            if entry:
+                self._remove_keys(entry)
+                self._memo = {}
+    
+    def _remove_keys(self, entry):
+        """Drop the index keys of an entry (caller holds the lock)"""
+        for key in self._keys_for(entry['folded']):
+            i = bisect_left(self._keys, (key, entry['_id']))
+            if i < len(self._keys) and self._keys[i] == (key, entry['_id']):
+                del self._keys[i]
+        for gram in entry['grams']:
+            postings = self._trigrams.get(gram)
+            if postings:
+                postings.discard(entry['_id'])
+    
+    def sync(self):
+        """Pick up movies written by other workers since the last sync"""
+        with self._lock:
+            since = self._synced_at
+        now = datetime.utcnow()
+        for movie in self.collection.find({'updated_at': {'$gte': since}}, self._projection()):
+            self.add(movie)
+        with self._lock:
+            self._synced_at = now
+    
+    def start(self):
+        """Build the index and keep it fresh on a background thread"""
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, daemon=True)
+                    self._worker.start()
+    
+    def _ready(self):
+        """Whether the index can serve lookups (starting it if nobody has)"""
+        self.start()
+        return self._built_at is not None
+    
+    def _run(self):
+        """Build once, then sync new titles often and rebuild (refreshing popularity) now and then"""
+        while self._built_at is None:
+            try:
+                self.rebuild()
+            except Exception as e:
+                print(f"Error building title index: {str(e)}")
+                time.sleep(max(Config.TITLE_INDEX_SYNC_INTERVAL, 1))
+        
+        if Config.TITLE_INDEX_SYNC_INTERVAL <= 0:
+            return
+        
+        while True:
+            time.sleep(Config.TITLE_INDEX_SYNC_INTERVAL)
+            try:
+                if time.monotonic() - self._built_at >= Config.TITLE_INDEX_REBUILD_INTERVAL:
+                    self.rebuild()
+                else:
+                    self.sync()
+            except Exception as e:
+                print(f"Error refreshing title index: {str(e)}")
+    
+    def _top(self, prefix, limit):
+        """Rank the movies whose keys start with prefix (caller holds the lock)"""
+        lo = bisect_left(self._keys, (prefix,))
+        hi = bisect_left(self._keys, (prefix + '\uffff',))
+        
+        movie_ids = dict.fromkeys(movie_id for _, movie_id in self._keys[lo:hi])
+        return heapq.nlargest(
+            limit,
+            (self._movies[movie_id] for movie_id in movie_ids),
+            key=lambda entry: entry['popularity']
+        )
+    
+    def suggest(self, query, limit=8):
+        """Get the most popular movies whose title starts with query"""
+        prefix = fold_title(query)
+        if not prefix or not self._ready():
+            return []
+        
+        with self._lock:
+            if len(prefix) > self.MEMO_PREFIX_LENGTH:
+                matches = self._top(prefix, limit)
+            else:
+                # Short prefixes are ranked once up to the max page size
+                if prefix not in self._memo:
+                    self._memo[prefix] = self._top(prefix, Config.SUGGEST_MAX_RESULTS)
+                matches = self._memo[prefix][:limit]
+        
+        return [self._public(entry) for entry in matches]
+    
+    def fuzzy_search(self, query, limit=10, min_similarity=None):
+        """Find titles that contain most of the query's trigrams
+        
+        Similarity is the share of the query's trigrams found in the title;
+        ties go to the title closest in length, then the most viewed.
+        """
+        if min_similarity is None:
+            min_similarity = Config.FUZZY_MIN_SIMILARITY
+        
+        grams = self.trigrams(fold_title(query))
+        if len(grams) < 3 or not self._ready():
+            return []
+        
+        needed = math.ceil(min_similarity * len(grams))
+        with self._lock:
+            # A title sharing `needed` trigrams must share at least one of the
+            # len - needed + 1 rarest, so only their postings are candidates
+            postings = sorted((self._trigrams.get(gram, ()) for gram in grams), key=len)
+            candidates = set().union(*postings[:len(grams) - needed + 1])
+            
+            scored = []
+            for movie_id in candidates:
+                entry = self._movies[movie_id]
+                count = len(grams & entry['grams'])
+                if count < needed:
+                    continue
+                # Dice coefficient prefers "Batman" over "Batman Begins" for "batman"
+                dice = 2 * count / (len(grams) + len(entry['grams']))
+                scored.append((count / len(grams), dice, entry['popularity'], entry))
+        
+        best = heapq.nlargest(limit, scored, key=lambda s: s[:3])
+        return [
+            {**self._public(entry), 'similarity': round(similarity, 3)}
+            for similarity, _, _, entry in best
+        ]
+    
+    @staticmethod
+    def _public(entry):
+        """An entry without its internal ranking fields"""
+        return {k: v for k, v in entry.items() if k not in ('folded', 'grams', 'popularity')}
+    
+    def get_stats(self):
+        """Get the size of the index"""
+        with self._lock:
+            return {
+                'movies': len(self._movies),
+                'keys': len(self._keys),
+                'trigrams': len(self._trigrams)
+            }
+
+# Shared by every Movie model in this process
+title_index = TitleIndex()
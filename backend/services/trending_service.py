@@ -0,0 +1,171 @@
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo import UpdateOne
+from config import Config
+from services.counter_buffer import CounterBuffer
+from services.single_flight import SingleFlight
+from services.response_cache import response_cache
+
+class ViewBucketBuffer(CounterBuffer):
+    """Counter buffer that adds views to per-movie hourly buckets"""
+    
+    def _operation(self, key, amount):
+        """Upsert the (movie, hour) bucket and add the buffered views"""
+        movie_id, bucket = key
+        return UpdateOne(
+            {'movie_id': movie_id, 'bucket': bucket},
+            {'$inc': {self.field: amount}},
+            upsert=True
+        )
+
+class TrendingService:
+    """Time-decayed trending scores materialized into a small collection"""
+    
+    # Fields stored for each trending entry
+    CARD_FIELDS = ['imdb_id', 'title', 'year', 'poster', 'genre', 'imdb_rating', 'production_house']
+    
+    def __init__(self, db):
+        self.db = db
+        self.movies = db.movies
+        self.buckets = db.movie_view_buckets
+        self.collection = db.trending
+        self.view_buckets = ViewBucketBuffer(self.buckets, 'count')
+        self.refresh_flight = SingleFlight(db, 'trending', Config.TRENDING_LEASE_SECONDS)
+        self._scheduler = None
+        self._ensure_indexes()
+    
+    def _ensure_indexes(self):
+        """Create indexes for better query performance"""
+        self.buckets.create_index([('movie_id', 1), ('bucket', 1)], unique=True)
+        # Buckets older than the scoring window are never read again
+        self.buckets.create_index(
+            'bucket',
+            expireAfterSeconds=int(Config.TRENDING_WINDOW_HOURS * 3600 * 2)
+        )
+    
+    def record_view(self, movie_id):
+        """Count a view in the current hourly bucket (buffered)"""
+        bucket = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+        self.view_buckets.increment((movie_id, bucket))
+    
+    def compute(self):
+        """Score recent views with exponential decay and store the top-N per scope"""
+        started_at = datetime.utcnow()
+        window_start = started_at - timedelta(hours=Config.TRENDING_WINDOW_HOURS)
+        decay = math.log(2) / Config.TRENDING_HALF_LIFE_HOURS
+        
+        # score = sum(count * e^(-decay * age_in_hours)) over the window
+        age_hours = {'$divide': [{'$subtract': [started_at, '$bucket']}, 3600 * 1000]}
+        scores = list(self.buckets.aggregate([
+            {'$match': {'bucket': {'$gte': window_start}}},
+            {'$group': {
+                '_id': '$movie_id',
+                'score': {'$sum': {
+                    '$multiply': ['$count', {'$exp': {'$multiply': [-decay, age_hours]}}]
+                }}
+            }},
+            {'$sort': {'score': -1}},
+            {'$limit': Config.TRENDING_CANDIDATES}
+        ]))
+        
+        movie_ids = [ObjectId(s['_id']) for s in scores if ObjectId.is_valid(s['_id'])]
+        projection = {field: 1 for field in self.CARD_FIELDS + ['genres', 'production_houses']}
+        movies = {str(m['_id']): m for m in self.movies.find({'_id': {'$in': movie_ids}}, projection)}
+        
+        # Candidates arrive sorted by score, so each scope fills in order
+        top_n = Config.TRENDING_TOP_N
+        scopes = {'global': []}
+        for entry in scores:
+            movie = movies.get(entry['_id'])
+            if not movie:
+                continue
+            
+            card = {field: movie.get(field) for field in self.CARD_FIELDS}
+            card['_id'] = entry['_id']
+            card['score'] = round(entry['score'], 4)
+            
+            keys = ['global'] + [f"genre:{genre}" for genre in movie.get('genres', [])]
+            keys.extend(f"house:{house}" for house in movie.get('production_houses', []))
+            
+            for key in keys:
+                scope = scopes.setdefault(key, [])
+                if len(scope) < top_n:
+                    scope.append(card)
+        
+        operations = [
+            UpdateOne(
+                {'_id': key},
+                {'$set': {'movies': cards, 'computed_at': started_at}},
+                upsert=True
+            )
+            for key, cards in scopes.items()
+        ]
+        self.collection.bulk_write(operations, ordered=False)
+        
+        # Drop scopes that had no views in this window
+        self.collection.delete_many({'computed_at': {'$lt': started_at}})
+        response_cache.invalidate('trending')
+        
+        return {'scopes': len(scopes), 'movies_scored': len(scores), 'computed_at': started_at}
+    
+    def get_trending(self, scope='global', limit=10):
+        """Get the materialized trending list for a scope, or None if not computed
+        
+        A list computed from a window with no views counts as not computed,
+        so callers fall back to lifetime views instead of showing nothing.
+        """
+        doc = self.collection.find_one({'_id': scope}, {'movies': {'$slice': limit}})
+        if not doc or not doc['movies']:
+            return None
+        return doc['movies']
+    
+    @staticmethod
+    def scope_for(genre=None, production_house=None):
+        """Build the scope key for an optional genre or production house"""
+        if genre:
+            return f"genre:{genre.strip().lower()}"
+        if production_house:
+            return f"house:{production_house}"
+        return 'global'
+    
+    @staticmethod
+    def scope_query(scope):
+        """Build the movies query matching a scope key from scope_for"""
+        if scope.startswith('genre:'):
+            return {'genres': scope[len('genre:'):]}
+        if scope.startswith('house:'):
+            return {'production_houses': scope[len('house:'):]}
+        return {}
+    
+    def _fresh_computed_at(self):
+        """Get the last computation time if it is still within the refresh interval"""
+        doc = self.collection.find_one({'_id': 'global'}, {'computed_at': 1})
+        cutoff = datetime.utcnow() - timedelta(seconds=Config.TRENDING_REFRESH_INTERVAL)
+        if doc and doc['computed_at'] > cutoff:
+            return doc['computed_at']
+        return None
+    
+    def refresh_if_stale(self):
+        """Recompute when stale; the lease lets only one worker do the work"""
+        if self._fresh_computed_at():
+            return None
+        return self.refresh_flight.do('refresh', self.compute, check=self._fresh_computed_at)
+    
+    def start_scheduler(self):
+        """Refresh trending scores in the background every refresh interval"""
+        if self._scheduler or Config.TRENDING_REFRESH_INTERVAL <= 0:
+            return
+        
+        def run():
+            while True:
+                try:
+                    self.refresh_if_stale()
+                except Exception as e:
+                    print(f"Error refreshing trending movies: {str(e)}")
+                time.sleep(Config.TRENDING_REFRESH_INTERVAL)
+        
+        self._scheduler = threading.Thread(target=run, daemon=True)
+        self._scheduler.start()
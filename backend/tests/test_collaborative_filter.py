@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+import pytest
+from services.collaborative_filter import CollaborativeFilter
+
+MOVIES = [f"m{i}" for i in range(6)]
+
+class FakeCursor(list):
+    def batch_size(self, size):
+        return self
+
+class FakeCollection:
+    def __init__(self, docs=()):
+        self.docs = list(docs)
+        self.written = []
+    
+    def find(self, query=None, projection=None):
+        return FakeCursor(self.docs)
+    
+    def bulk_write(self, operations, ordered=True):
+        self.written.extend(operations)
+    
+    def delete_many(self, query):
+        pass
+
+def make_users():
+    """Users whose likes overlap in a few recurring pairs"""
+    likes = [
+        ['m0', 'm1'], ['m0', 'm1', 'm2'], ['m1', 'm2'], ['m0', 'm1'],
+        ['m3', 'm4'], ['m3', 'm4', 'm0'], ['m2', 'm5'], ['m0', 'm1', 'm3'],
+    ]
+    return [
+        {'favorites': [{'movie_id': movie_id} for movie_id in liked[:1]],
+         'watchlist': liked[1:]}
+        for liked in likes
+    ]
+
+def build(batch_size):
+    db = SimpleNamespace(
+        users=FakeCollection(make_users()),
+        movies=FakeCollection({'_id': movie_id} for movie_id in MOVIES),
+        movie_neighbors=FakeCollection()
+    )
+    stats = CollaborativeFilter(db).build(top_k=10, batch_size=batch_size)
+    neighbors = {op._filter['_id']: op._doc['neighbors'] for op in db.movie_neighbors.written}
+    return stats, neighbors
+
+def test_batches_accumulate_like_a_single_pass():
+    # 3 users per batch leaves a partial last batch; co-occurrences span batches
+    single_stats, single = build(batch_size=100)
+    batched_stats, batched = build(batch_size=3)
+    
+    assert batched_stats['users'] == single_stats['users'] == 8
+    assert batched_stats['interactions'] == single_stats['interactions']
+    assert batched.keys() == single.keys()
+    for movie_id, expected in single.items():
+        assert [n['movie_id'] for n in batched[movie_id]] == [n['movie_id'] for n in expected]
+        assert [n['score'] for n in batched[movie_id]] == pytest.approx([n['score'] for n in expected], abs=1e-4)
+
+def test_pairs_below_min_support_are_dropped():
+    _, neighbors = build(batch_size=3)
+    
+    # m2 and m5 share one user; m0 and m1 share four
+    assert 'm5' not in neighbors
+    assert neighbors['m0'][0]['movie_id'] == 'm1'
+    assert neighbors['m0'][0]['score'] < 1.0
@@ -0,0 +1,95 @@
+from types import SimpleNamespace
+from bson import ObjectId
+from services.content_similarity import ContentSimilarity
+
+class FakeCursor(list):
+    def sort(self, keys):
+        return self
+    
+    def limit(self, count):
+        return FakeCursor(self[:count])
+
+class FakeMovies:
+    def __init__(self, movies):
+        self.movies = movies
+        self.written = []
+    
+    def find(self, query=None, projection=None):
+        excluded = ((query or {}).get('_id') or {}).get('$ne')
+        return FakeCursor(movie for movie in self.movies if movie['_id'] != excluded)
+    
+    def bulk_write(self, operations, ordered=True):
+        self.written.extend(operations)
+
+class FakeModel:
+    def __init__(self):
+        self.doc = None
+    
+    def replace_one(self, query, doc, upsert=False):
+        self.doc = {'_id': query['_id'], **doc}
+    
+    def find_one(self, query, projection=None):
+        return self.doc
+
+def movie(title, genre, director, plot):
+    return {
+        '_id': ObjectId(), 'imdb_id': f"tt-{title}", 'title': title, 'year': '2000',
+        'poster': 'N/A', 'genre': genre, 'genres': genre.split(', '), 'director': director,
+        'actors': 'N/A', 'production_houses': [], 'plot': plot
+    }
+
+CATALOG = [
+    movie('Alien', 'Horror, Sci-Fi', 'Ridley Scott', 'A crew aboard a spaceship hunted by an alien creature'),
+    movie('Aliens', 'Action, Sci-Fi', 'James Cameron', 'Marines return to fight the alien creature colony'),
+    movie('Notting Hill', 'Comedy, Romance', 'Roger Michell', 'A bookshop owner falls for a famous actress'),
+    movie('Love Actually', 'Comedy, Romance', 'Richard Curtis', 'Eight couples fall in love at Christmas in London'),
+]
+
+def make_similarity(movies):
+    db = SimpleNamespace(movies=FakeMovies(movies), content_model=FakeModel())
+    return ContentSimilarity(db), db
+
+def similar_by_title(operations):
+    return {
+        op._filter['_id']: [(card['title'], card['score']) for card in op._doc['$set']['similar']]
+        for op in operations if '$set' in op._doc
+    }
+
+def test_build_ranks_shared_genres_and_plot_first():
+    similarity, db = make_similarity(CATALOG)
+    
+    assert similarity.build(top_k=2, block_size=3)['movies'] == 4
+    
+    similar = similar_by_title(db.movies.written)
+    alien = similar[CATALOG[0]['_id']]
+    assert alien[0][0] == 'Aliens'
+    assert all(title != 'Alien' for title, _ in alien)
+    assert similar[CATALOG[2]['_id']][0][0] == 'Love Actually'
+    # Scores are cosines, best first
+    assert all(0 < score <= 1 for _, score in alien)
+    assert [score for _, score in alien] == sorted((score for _, score in alien), reverse=True)
+
+def test_add_movie_scores_against_candidates_and_offers_itself():
+    similarity, db = make_similarity(CATALOG)
+    similarity.build()
+    db.movies.written = []
+    
+    new = movie('Prometheus', 'Adventure, Sci-Fi', 'Ridley Scott', 'A crew aboard a spaceship meets an alien creator')
+    similarity.add_movie(new)
+    
+    own, *offers = db.movies.written
+    assert own._filter == {'_id': new['_id']}
+    assert [card['title'] for card in own._doc['$set']['similar']][0] == 'Alien'
+    
+    # Candidates take the new movie only if it beats their k-th neighbor
+    offered = {op._filter['_id']: op._doc['$push']['similar']['$each'][0] for op in offers}
+    assert CATALOG[0]['_id'] in offered
+    assert offered[CATALOG[0]['_id']]['movie_id'] == str(new['_id'])
+    assert offered[CATALOG[0]['_id']]['score'] > 0
+
+def test_add_movie_waits_for_a_build():
+    similarity, db = make_similarity(CATALOG)
+    
+    similarity.add_movie(movie('Prometheus', 'Sci-Fi', 'Ridley Scott', 'An alien creator'))
+    
+    assert db.movies.written == []
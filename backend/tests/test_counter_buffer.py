@@ -0,0 +1,47 @@
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from services.counter_buffer import CounterBuffer
+
+class FailingCollection:
+    """Applies every operation except those at the given indexes"""
+    
+    def __init__(self, failing_indexes=(), error=None):
+        self.failing_indexes = set(failing_indexes)
+        self.error = error
+        self.applied = []
+    
+    def bulk_write(self, operations, ordered=True):
+        if self.error:
+            raise self.error
+        
+        errors = []
+        for index, operation in enumerate(operations):
+            if index in self.failing_indexes:
+                errors.append({'index': index, 'code': 121, 'errmsg': 'Document failed validation'})
+            else:
+                self.applied.append(operation)
+        if errors:
+            raise BulkWriteError({'writeErrors': errors, 'nModified': len(self.applied)})
+
+def make_buffer(collection):
+    # A long interval keeps the background flusher out of the test
+    return CounterBuffer(collection, 'view_count', flush_interval=3600, max_pending=1000)
+
+def test_partial_failure_requeues_only_failed_operations():
+    ids = [str(ObjectId()) for _ in range(3)]
+    collection = FailingCollection(failing_indexes=[1])
+    buffer = make_buffer(collection)
+    for movie_id, amount in zip(ids, (2, 5, 7)):
+        buffer.increment(movie_id, amount)
+    
+    assert buffer.flush() == 2
+    assert len(collection.applied) == 2
+    assert buffer._counts == {ids[1]: 5}
+
+def test_unknown_failure_keeps_every_count():
+    movie_id = str(ObjectId())
+    buffer = make_buffer(FailingCollection(error=RuntimeError('connection reset')))
+    buffer.increment(movie_id, 3)
+    
+    assert buffer.flush() == 0
+    assert buffer._counts == {movie_id: 3}
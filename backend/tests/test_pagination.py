@@ -0,0 +1,131 @@
+import base64
+from datetime import datetime
+import pytest
+from bson import ObjectId, json_util
+from services.pagination import (
+    InvalidCursor, _keyset_filter, decode_cursor, encode_cursor, paginate
+)
+
+def make_token(payload):
+    """Encode an arbitrary payload the way encode_cursor does"""
+    raw = json_util.dumps(payload).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+    
+    def sort(self, keys):
+        return self
+    
+    def skip(self, n):
+        self.docs = self.docs[n:]
+        return self
+    
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+    
+    def __iter__(self):
+        return iter(self.docs)
+
+class FakeCollection:
+    """Returns its documents in order, keeping only the projected fields"""
+    
+    def __init__(self, docs):
+        self.docs = docs
+        self.projection = None
+    
+    def find(self, query, projection=None):
+        self.projection = projection
+        fields = set(projection or {}) | {'_id'}
+        return FakeCursor([{k: v for k, v in doc.items() if k in fields} for doc in self.docs])
+
+@pytest.mark.parametrize('value', [
+    'The Matrix', 7.5, 1999, None, datetime(2024, 1, 2, 3, 4, 5)
+])
+def test_cursor_round_trip(value):
+    last_id = ObjectId()
+    decoded_value, decoded_id = decode_cursor(encode_cursor(value, last_id))
+    assert decoded_id == last_id
+    if isinstance(value, datetime):
+        assert decoded_value.replace(tzinfo=None) == value
+    else:
+        assert decoded_value == value
+
+@pytest.mark.parametrize('payload', [
+    {'v': {'$regex': '^(a+)+$'}, 'id': ObjectId()},
+    {'v': {'$gt': ''}, 'id': ObjectId()},
+    {'v': ['a', 'b'], 'id': ObjectId()},
+    {'v': 'x', 'id': {'$gt': ''}},
+    {'v': 'x', 'id': 'not-an-object-id'},
+    {'v': 'x'},
+    {'id': ObjectId()}
+])
+def test_decode_cursor_rejects_crafted_payloads(payload):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(make_token(payload))
+
+def test_decode_cursor_rejects_bson_regex():
+    token = make_token({'v': {'$regularExpression': {'pattern': '^(a+)+$', 'options': ''}},
+                        'id': ObjectId()})
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token)
+
+@pytest.mark.parametrize('token', ['', '!!!', 'bm90IGpzb24', base64.urlsafe_b64encode(b'[1, 2]').decode()])
+def test_decode_cursor_rejects_garbage(token):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(token)
+
+def test_keyset_filter_on_id():
+    last_id = ObjectId()
+    assert _keyset_filter('_id', -1, last_id, last_id) == {'_id': {'$lt': last_id}}
+    assert _keyset_filter('_id', 1, last_id, last_id) == {'_id': {'$gt': last_id}}
+
+def test_keyset_filter_descending():
+    last_id = ObjectId()
+    assert _keyset_filter('year_start', -1, 2001, last_id) == {'$or': [
+        {'year_start': {'$lt': 2001}},
+        {'year_start': 2001, '_id': {'$lt': last_id}},
+        # Missing years sort last descending, so they are still ahead
+        {'year_start': None}
+    ]}
+
+def test_keyset_filter_ascending():
+    last_id = ObjectId()
+    assert _keyset_filter('title', 1, 'Alien', last_id) == {'$or': [
+        {'title': {'$gt': 'Alien'}},
+        {'title': 'Alien', '_id': {'$gt': last_id}}
+    ]}
+
+def test_keyset_filter_null_descending_only_has_ties_left():
+    last_id = ObjectId()
+    assert _keyset_filter('year_start', -1, None, last_id) == {
+        'year_start': None, '_id': {'$lt': last_id}
+    }
+
+def test_keyset_filter_null_ascending_moves_on_to_present_values():
+    last_id = ObjectId()
+    assert _keyset_filter('year_start', 1, None, last_id) == {'$or': [
+        {'year_start': None, '_id': {'$gt': last_id}},
+        {'year_start': {'$ne': None}}
+    ]}
+
+def test_paginate_drops_injected_sort_field():
+    docs = [{'_id': ObjectId(), 'title': f'M{i}', 'year_start': 2000 + i} for i in range(3)]
+    collection = FakeCollection(docs)
+    
+    page, next_cursor = paginate(collection, {}, 'year_start', -1, limit=2, projection={'title': 1})
+    
+    assert collection.projection == {'title': 1, 'year_start': 1}
+    assert page == [{'_id': docs[0]['_id'], 'title': 'M0'}, {'_id': docs[1]['_id'], 'title': 'M1'}]
+    assert decode_cursor(next_cursor) == (2001, docs[1]['_id'])
+
+def test_paginate_keeps_projected_sort_field():
+    docs = [{'_id': ObjectId(), 'title': 'M0', 'year_start': 2000}]
+    page, next_cursor = paginate(
+        FakeCollection(docs), {}, 'year_start', -1, limit=2,
+        projection={'title': 1, 'year_start': 1}
+    )
+    assert page[0]['year_start'] == 2000
+    assert next_cursor is None
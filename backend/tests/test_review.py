@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+from bson import ObjectId
+from models.review import Review
+
+class FakeReviews:
+    def __init__(self):
+        self.docs = {}
+    
+    def create_index(self, keys):
+        pass
+    
+    def insert_one(self, doc):
+        doc['_id'] = ObjectId()
+        self.docs[doc['_id']] = doc
+        return SimpleNamespace(inserted_id=doc['_id'])
+    
+    def delete_one(self, query):
+        self.docs.pop(query['_id'], None)
+
+class FakeMovies:
+    """Movies by _id; vanish_on_update drops the movie right before the $inc"""
+    
+    def __init__(self, ids, vanish_on_update=False):
+        self.counts = {movie_id: 0 for movie_id in ids}
+        self.vanish_on_update = vanish_on_update
+    
+    def find_one(self, query, projection=None):
+        return {'_id': query['_id']} if query['_id'] in self.counts else None
+    
+    def update_one(self, query, update):
+        if self.vanish_on_update:
+            self.counts.pop(query['_id'], None)
+        if query['_id'] not in self.counts:
+            return SimpleNamespace(matched_count=0)
+        self.counts[query['_id']] += update['$inc']['review_count']
+        return SimpleNamespace(matched_count=1)
+
+def make_model(movies):
+    return Review(SimpleNamespace(reviews=FakeReviews(), movies=movies))
+
+def test_review_counts_after_insert():
+    movie_id = ObjectId()
+    model = make_model(FakeMovies([movie_id]))
+    
+    review = model.create_review(str(movie_id), 'user', 'Great')
+    
+    assert review['movie_id'] == str(movie_id)
+    assert model.movies.counts[movie_id] == 1
+    assert len(model.collection.docs) == 1
+
+def test_missing_movie_writes_nothing():
+    model = make_model(FakeMovies([]))
+    
+    assert model.create_review(str(ObjectId()), 'user', 'Great') is None
+    assert model.collection.docs == {}
+
+def test_movie_deleted_mid_review_leaves_no_orphan():
+    movie_id = ObjectId()
+    model = make_model(FakeMovies([movie_id], vanish_on_update=True))
+    
+    assert model.create_review(str(movie_id), 'user', 'Great') is None
+    assert model.collection.docs == {}
@@ -0,0 +1,73 @@
+from services import search_service
+from services.search_service import SearchService
+
+class FakeMovieModel:
+    CARD_PROJECTION = {}
+    
+    def __init__(self, count):
+        self.movies = [
+            {'_id': f"m{i}", 'imdb_id': f"tt{i}", 'title': f"Movie {i}"}
+            for i in range(count)
+        ]
+    
+    def search_movies(self, query, skip, limit, projection, filters):
+        return [dict(movie) for movie in self.movies[skip:skip + limit]]
+
+class FakeOMDb:
+    """OMDb with `total` hits; the first `overlap` are local movies"""
+    
+    def __init__(self, total, overlap=0):
+        self.hits = [
+            {'imdbID': f"tt{i}" if i < overlap else f"om{i}", 'Title': f"Hit {i}", 'Year': '2001',
+             'Poster': 'N/A', 'Type': 'movie'}
+            for i in range(total)
+        ]
+        self.pages = []
+    
+    def search_movies(self, query, year=None, page=1):
+        self.pages.append(page)
+        return {'results': self.hits[(page - 1) * 10:page * 10], 'total_results': str(len(self.hits))}
+
+def make_service(monkeypatch, local, omdb):
+    monkeypatch.setattr(search_service.title_index, 'fuzzy_search', lambda *args: [])
+    return SearchService(FakeMovieModel(local), omdb)
+
+def test_local_pages_report_more_only_before_the_last(monkeypatch):
+    omdb = FakeOMDb(total=0)
+    service = make_service(monkeypatch, 15, omdb)
+    
+    first = service.search('movie', page=1)
+    assert first['source'] == 'local'
+    assert first['has_more'] is True
+    assert omdb.pages == []
+    
+    last = service.search('movie', page=2)
+    assert last['has_more'] is False
+    assert last['total_results'] == 15
+
+def test_last_local_page_continues_into_omdb_titles_we_lack(monkeypatch):
+    service = make_service(monkeypatch, 15, FakeOMDb(total=12, overlap=4))
+    
+    last = service.search('movie', page=2)
+    
+    assert last['has_more'] is True
+    assert last['total_results'] == 15 + 12 - 4
+
+def test_merged_total_subtracts_local_titles_omdb_returned(monkeypatch):
+    service = make_service(monkeypatch, 3, FakeOMDb(total=8, overlap=2))
+    
+    result = service.search('movie')
+    
+    assert result['source'] == 'merged'
+    assert result['total_results'] == 3 + 8 - 2
+    assert len(result['results']) == 3 + 6
+    assert result['has_more'] is False
+
+def test_omdb_cards_keep_omdb_keys(monkeypatch):
+    service = make_service(monkeypatch, 0, FakeOMDb(total=1))
+    
+    card = service.search('hit')['results'][0]
+    
+    assert card['imdb_id'] == card['imdbID'] == 'om0'
+    assert card['title'] == card['Title'] == 'Hit 0'
+    assert card['poster'] == card['Poster']
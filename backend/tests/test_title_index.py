@@ -0,0 +1,65 @@
+from bson import ObjectId
+from services.title_index import TitleIndex
+
+class FakeMovies:
+    def __init__(self, movies):
+        self.movies = movies
+    
+    def find(self, query, projection=None):
+        return list(self.movies)
+
+def make_index(*titles):
+    """A built index over titles; the view count falls with each title"""
+    movies = [
+        {'_id': ObjectId(), 'title': title, 'view_count': 100 - i}
+        for i, title in enumerate(titles)
+    ]
+    index = TitleIndex()
+    index.collection = FakeMovies(movies)
+    index.rebuild()
+    # Built by hand, so lookups must not start the background worker
+    index._worker = object()
+    return index, movies
+
+def titles(results):
+    return [result['title'] for result in results]
+
+def test_lookups_wait_for_the_first_build():
+    index = TitleIndex()
+    index._worker = object()
+    
+    assert index.suggest('mat') == []
+    assert index.fuzzy_search('matrix') == []
+
+def test_remove_drops_prefix_and_trigram_keys():
+    index, movies = make_index('The Matrix', 'Matilda')
+    
+    index.remove(str(movies[0]['_id']))
+    
+    assert titles(index.suggest('mat')) == ['Matilda']
+    assert index.fuzzy_search('the matrix') == []
+    assert index.get_stats()['movies'] == 1
+
+def test_fuzzy_search_tolerates_typos():
+    index, _ = make_index('The Shawshank Redemption', 'Spider-Man', 'Redemption Road')
+    
+    assert titles(index.fuzzy_search('shawshank redemtion'))[0] == 'The Shawshank Redemption'
+    assert titles(index.fuzzy_search('spiderman'))[0] == 'Spider-Man'
+
+def test_fuzzy_search_prefers_the_closest_length_then_views():
+    index, _ = make_index('Batman Begins', 'Batman', 'Batman Returns')
+    
+    results = index.fuzzy_search('batman')
+    
+    # All three contain every trigram of the query; the exact title wins,
+    # then the more viewed of the longer ones
+    assert titles(results) == ['Batman', 'Batman Begins', 'Batman Returns']
+    assert results[0]['similarity'] == 1.0
+
+def test_fuzzy_search_applies_min_similarity():
+    index, _ = make_index('Alien', 'Aliens')
+    
+    assert index.fuzzy_search('zombieland') == []
+    # "Aliens" lacks the query's end-of-word trigram "en "
+    assert titles(index.fuzzy_search('alien', min_similarity=1.0)) == ['Alien']
+    assert titles(index.fuzzy_search('alien', min_similarity=0.5)) == ['Alien', 'Aliens']